@@ -1,9 +1,10 @@
 # backend/api/routers/events_combined.py
 from typing import Optional
 from fastapi import APIRouter, Query
+from fastapi.responses import Response
 
 from backend.api.deps import validate_date
-from backend.events_combined import load_events_combined
+from backend.events_combined import load_events_combined_json
 
 router = APIRouter(prefix="/events", tags=["Events Combined"])
 
@@ -18,4 +19,6 @@ async def events_combined(
         validate_date(start, "start")
     if end:
         validate_date(end, "end")
-    return await load_events_combined(start, end, status, bbox)
+    # События USGS лежат колонками — пишем JSON напрямую, минуя jsonable_encoder
+    body = await load_events_combined_json(start, end, status, bbox)
+    return Response(content=body, media_type="application/json")
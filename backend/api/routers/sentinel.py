@@ -16,7 +16,7 @@ router = APIRouter(prefix="/sentinel", tags=["Sentinel"])
 
 
 @router.get("/search")
-def sentinel_search(
+async def sentinel_search(
     bbox: List[float] = Depends(BBox),
     start: Optional[str] = Depends(OptionalDate("start")),
     end: Optional[str] = Depends(OptionalDate("end")),
@@ -29,7 +29,7 @@ def sentinel_search(
     Returns a list of product cards suitable for the frontend.
     """
     try:
-        items = search_products(
+        items = await search_products(
             bbox=bbox,
             start=start,
             end=end,
@@ -44,12 +44,12 @@ def sentinel_search(
 
 
 @router.get("/quicklook/{product_id}")
-def sentinel_quicklook(product_id: str):
+async def sentinel_quicklook(product_id: str):
     """
     Returns quicklook (thumbnail) for product_id as image/jpeg/png.
     """
     try:
-        data = get_quicklook(product_id)
+        data = await get_quicklook(product_id)
         # Content-type can be jpeg or png - defaulting to jpeg
         return Response(content=data, media_type="image/jpeg")
     except Exception as e:
@@ -58,21 +58,21 @@ def sentinel_quicklook(product_id: str):
 
 
 @router.get("/product/{product_id}")
-def sentinel_product_info(product_id: str):
+async def sentinel_product_info(product_id: str):
     """
     Detailed product information (for debugging/metadata).
     """
     try:
-        return get_product_info(product_id)
+        return await get_product_info(product_id)
     except Exception as e:
         # 503 Service Unavailable - upstream CDSE service failure
         raise HTTPException(503, f"Failed to get product info: {e}")
 
 
 @router.get("/health")
-def sentinel_health():
+async def sentinel_health():
     """
     Simple CDSE API health check.
     """
-    ok = check_cdse_health()
+    ok = await check_cdse_health()
     return {"ok": ok}
@@ -135,7 +135,7 @@ def bbox():
 
 
 @router.get("/health")
-def health():
+async def health():
     """
     Системный health:
     - доступ к директориям
@@ -153,7 +153,7 @@ def health():
     ])
 
     # check_cdse_health() может зависеть от токена/кредов — оставляем как есть
-    cdse_ok = bool(check_cdse_health())
+    cdse_ok = bool(await check_cdse_health())
 
     has_cdse_credentials = bool(
         (getattr(settings, "CDSE_CLIENT_ID", None) and getattr(settings, "CDSE_CLIENT_SECRET", None))
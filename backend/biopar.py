@@ -57,6 +57,7 @@ from backend.biopar_sentinelhub import (
     MosaickingOrder
 )
 from backend.settings import settings
+from backend.utils.stats import compute_comprehensive_stats
 from backend.constants import (
     STATUS_SUCCESS,
     STATUS_ERROR,
@@ -542,23 +543,6 @@ def _masked_mean(arr: np.ndarray) -> float:
     return float(np.nan) if not m.any() else float(np.nanmean(arr[m]))
 
 
-def _compute_percentiles(arr: np.ndarray, ks=(10, 25, 50, 75, 90)) -> Dict[str, Optional[float]]:
-    """Вычисляет перцентили массива."""
-    vals = arr[np.isfinite(arr)]
-    if vals.size == 0:
-        # Очистка памяти перед возвратом
-        del vals
-        return {f"p{k}": None for k in ks}
-    res = np.percentile(vals, ks)
-    result = {f"p{int(k)}": float(np.round(v, 4)) for k, v in zip(ks, res)}
-
-    # Явно удаляем временные массивы для освобождения памяти
-    del vals
-    del res
-
-    return result
-
-
 def compute_tiff_stats(
     tif_path: Path,
     aoi_geojson: Optional[Dict[str, Any]] = None
@@ -592,43 +576,23 @@ def compute_tiff_stats(
             else:
                 band = src.read(1, masked=True).filled(np.nan).astype(np.float32)
 
-        # Use masked arrays for more efficient operations
-        masked = np.ma.masked_invalid(band)
-        if masked.count() == 0:
+        # Один проход по маске isfinite вместо MaskedArray (np.ma.*);
+        # медиана и перцентили — из одного np.partition
+        stats = compute_comprehensive_stats(band)
+        if stats["pixels"] == 0:
             logger.warning("No valid data in GeoTIFF")
-            # Очистка памяти перед возвратом
-            del band
-            del masked
-            return {
-                "mean": None, "median": None, "std": None,
-                "min": None, "max": None,
-                "percentiles": {k: None for k in ["p10", "p25", "p50", "p75", "p90"]},
-                "pixels": 0
-            }
+            return stats
 
-        mean = float(masked.mean())
-        median = float(np.ma.median(masked))
-        std = float(masked.std())
-        vmin = float(masked.min())
-        vmax = float(masked.max())
-        pcts = _compute_percentiles(band)
-
-        result = {
-            "mean": round(mean, 4),
-            "median": round(median, 4),
-            "std": round(std, 4),
-            "min": round(vmin, 4),
-            "max": round(vmax, 4),
-            "percentiles": pcts,
-            "pixels": int(masked.count())
+        return {
+            "mean": round(stats["mean"], 4),
+            "median": round(stats["median"], 4),
+            "std": round(stats["std"], 4),
+            "min": round(stats["min"], 4),
+            "max": round(stats["max"], 4),
+            "percentiles": {k: round(v, 4) for k, v in stats["percentiles"].items()},
+            "pixels": stats["pixels"]
         }
 
-        # Явно удаляем большие массивы для освобождения памяти
-        del band
-        del masked
-
-        return result
-
     except Exception as e:
         logger.error(f"Ошибка вычисления статистики: {e}", exc_info=True)
         raise
@@ -210,6 +210,10 @@ def fetch_biopar_openeo(
             logger.warning("OpenEO client doesn't support timeout parameters, using defaults")
             cube.download(outputfile=str(cache_path), format="GTiff")
 
+        # Клиент openEO пишет файл сам — учитываем его в статистике кэша
+        from backend.utils import atomic_write_cache, record_cache_write
+        record_cache_write(cache_path)
+
         file_size = cache_path.stat().st_size
         logger.info(f"[openEO] {biopar_type} saved: {cache_name}, size: {file_size:,} bytes")
 
@@ -225,8 +229,11 @@ def fetch_biopar_openeo(
             "udp_url": BIOPAR_UDP_URL,
             "auth_mode": settings.OPENEO_AUTH_MODE,
         }
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        atomic_write_cache(
+            metadata_path,
+            json.dumps(metadata, ensure_ascii=False, indent=2).encode("utf-8"),
+            use_lock=False,
+        )
 
         return cache_path
 
@@ -263,11 +270,13 @@ def clear_cache(older_than_days: int | None = None) -> int:
     if older_than_days:
         cutoff_time = time.time() - (older_than_days * 86400)
 
+    from backend.utils import LOCK_NAME, remove_cache_file
+
     for file_path in CACHE_DIR.glob("*"):
-        if file_path.is_file():
+        if file_path.is_file() and file_path.name != LOCK_NAME:
             try:
                 if cutoff_time is None or file_path.stat().st_mtime < cutoff_time:
-                    file_path.unlink()
+                    remove_cache_file(file_path)
                     deleted += 1
             except Exception as ex:
                 logger.warning(f"Failed to delete {file_path}: {ex}")
@@ -793,7 +793,7 @@ def fetch_biopar_geotiff(
             # Сохраняем успешный результат атомарно
             # Используем atomic_write_cache для предотвращения частичных записей
             try:
-                from backend.utils import atomic_write_cache
+                from backend.utils import atomic_write_cache, remove_cache_file
                 atomic_write_cache(cache_path, content, use_lock=True)
                 logger.info(
                     f"BIOPAR {biopar_type.upper()} saved: {cache_name}, "
@@ -804,7 +804,7 @@ def fetch_biopar_geotiff(
                 logger.error(f"Failed to write cache file: {write_error}")
                 if cache_path.exists():
                     try:
-                        cache_path.unlink()
+                        remove_cache_file(cache_path)
                         logger.debug(f"Cleaned up partial cache file: {cache_path}")
                     except Exception as cleanup_error:
                         logger.warning(f"Could not clean up cache file: {cleanup_error}")
@@ -828,8 +828,11 @@ def fetch_biopar_geotiff(
             }
 
             try:
-                with open(metadata_path, "w") as f:
-                    json.dump(metadata, f, indent=2)
+                atomic_write_cache(
+                    metadata_path,
+                    json.dumps(metadata, indent=2).encode("utf-8"),
+                    use_lock=False,
+                )
             except Exception as meta_error:
                 # Метаданные не критичны, логируем и продолжаем
                 logger.warning(f"Could not save metadata: {meta_error}")
@@ -907,11 +910,13 @@ def clear_cache(older_than_days: Optional[int] = None) -> int:
     if older_than_days:
         cutoff_time = time.time() - (older_than_days * 86400)
     
+    from backend.utils import LOCK_NAME, remove_cache_file
+
     for file_path in CACHE_DIR.glob("*"):
-        if file_path.is_file():
+        if file_path.is_file() and file_path.name != LOCK_NAME:
             try:
                 if cutoff_time is None or file_path.stat().st_mtime < cutoff_time:
-                    file_path.unlink()
+                    remove_cache_file(file_path)
                     deleted += 1
             except Exception as e:
                 logger.warning(f"Failed to delete {file_path}: {e}")
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from backend.utils import LOCK_NAME, get_cache_stats, remove_cache_file
+
 logger = logging.getLogger(__name__)
 
 
@@ -165,17 +167,7 @@ class CacheMonitor:
         total_size_mb = total_size_bytes / (1024 * 1024)
         total_size_gb = total_size_bytes / (1024 * 1024 * 1024)
         usage_pct = (total_size_bytes / self.max_size_bytes * 100) if self.max_size_bytes > 0 else 0
-
-        # Determine alert status
-        if usage_pct >= self.critical_threshold_pct:
-            alert_level = "critical"
-            alert_message = f"Cache usage at {usage_pct:.1f}% (critical threshold: {self.critical_threshold_pct}%)"
-        elif usage_pct >= self.warning_threshold_pct:
-            alert_level = "warning"
-            alert_message = f"Cache usage at {usage_pct:.1f}% (warning threshold: {self.warning_threshold_pct}%)"
-        else:
-            alert_level = "ok"
-            alert_message = None
+        alert_level, alert_message = self._alert(usage_pct)
 
         return {
             "status": alert_level,
@@ -195,6 +187,45 @@ class CacheMonitor:
             "directories": [s.to_dict() for s in all_stats]
         }
 
+    def get_cache_summary(self) -> dict:
+        """
+        Get cache totals and alert status without walking the directories.
+
+        Totals come from get_cache_stats (Redis-backed, kept up to date by the
+        cache write/delete helpers), so this is cheap enough for health checks.
+
+        Returns:
+            Dictionary with alert status and total files/size/usage
+        """
+        total_files = 0
+        total_size_mb = 0.0
+        for path in self.cache_dirs.values():
+            stats = get_cache_stats(path)
+            total_files += stats["files"]
+            total_size_mb += stats["size_mb"]
+
+        usage_pct = (total_size_mb / self.max_size_mb * 100) if self.max_size_mb > 0 else 0
+        alert_level, alert_message = self._alert(usage_pct)
+
+        return {
+            "status": alert_level,
+            "message": alert_message,
+            "total": {
+                "files": total_files,
+                "size_mb": round(total_size_mb, 2),
+                "usage_pct": round(usage_pct, 2),
+                "max_size_mb": self.max_size_mb,
+            },
+        }
+
+    def _alert(self, usage_pct: float) -> tuple:
+        """Alert level and message for the given usage percentage."""
+        if usage_pct >= self.critical_threshold_pct:
+            return "critical", f"Cache usage at {usage_pct:.1f}% (critical threshold: {self.critical_threshold_pct}%)"
+        if usage_pct >= self.warning_threshold_pct:
+            return "warning", f"Cache usage at {usage_pct:.1f}% (warning threshold: {self.warning_threshold_pct}%)"
+        return "ok", None
+
     def get_cleanup_recommendations(self) -> dict:
         """
         Get recommendations for cache cleanup.
@@ -257,7 +288,7 @@ class CacheMonitor:
 
             try:
                 for file_path in path.rglob("*"):
-                    if not file_path.is_file():
+                    if not file_path.is_file() or file_path.name == LOCK_NAME:
                         continue
 
                     try:
@@ -265,7 +296,7 @@ class CacheMonitor:
                         if mtime < cutoff_time:
                             file_size = file_path.stat().st_size
                             if not dry_run:
-                                file_path.unlink()
+                                remove_cache_file(file_path)
                                 logger.info(f"Deleted old cache file: {file_path.name}")
                             deleted_count += 1
                             deleted_size += file_size
@@ -9,6 +9,8 @@ from backend.eonet import load_events as load_eonet
 from backend.providers.usgs_quakes import fetch_quakes_bbox
 from backend.providers.gdacs import load_gdacs          # ← используем существующую функцию
 from backend.providers.firms import fetch_firms_bbox
+from backend.providers.columnar import EventColumns, dumps_events_payload, iter_events
+from backend.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +22,11 @@ def _parse_bbox(bbox_str: Optional[str]) -> Tuple[float, float, float, float]:
     x1, y1, x2, y2 = vals[0], vals[1], vals[2], vals[3]
     return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
 
-async def load_events_combined(
-    start: Optional[str] = None,
-    end: Optional[str] = None,
-    status: str = "open",
-    bbox_str: Optional[str] = None,
+async def _gather_events(
+    start: Optional[str],
+    end: Optional[str],
+    status: str,
+    bbox_str: Optional[str],
 ) -> Dict[str, Any]:
     """
     Комбинирует события из нескольких источников:
@@ -32,22 +34,27 @@ async def load_events_combined(
       - USGS Earthquakes
       - GDACS (RSS/API через наш провайдер)
       - FIRMS (активные пожары)
+
+    "events" — вперемешку словари и пачки EventColumns (наружу не отдаётся).
     """
     bbox = _parse_bbox(bbox_str)
     logger.info("[combined] bbox=%s, dates=%s..%s", bbox, start, end)
 
+    # Все провайдеры работают параллельно через один пул соединений
+    client = get_http_client()
     tasks = [
         load_eonet(start, end, status, bbox_str),                 # EONET
-        fetch_quakes_bbox(bbox, start, end, min_magnitude=2.5,    # USGS
-                          limit=2000),
-        load_gdacs(bbox, start, end),                             # GDACS (как у тебя в провайдере)
+        fetch_quakes_bbox(start, end, bbox, min_magnitude=2.5,    # USGS
+                          limit=2000, client=client),
+        load_gdacs(start, end, bbox, client=client),              # GDACS
         fetch_firms_bbox(bbox, min_confidence=0,                  # FIRMS
                          limit_points=1000),
     ]
 
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
-    events: List[Dict[str, Any]] = []
+    # Словари событий и пачки EventColumns (разворачиваются при сериализации)
+    events: List[Any] = []
     stats_acc: Dict[str, int] = {"total": 0, "in_region": 0, "nearby": 0}
     by_category: Dict[str, int] = {}
 
@@ -59,7 +66,10 @@ async def load_events_combined(
         provider_events = (res or {}).get("events") or []
         provider_stats = (res or {}).get("stats") or {}
 
-        events.extend(provider_events)
+        if isinstance(provider_events, EventColumns):
+            events.append(provider_events)
+        else:
+            events.extend(provider_events)
         stats_acc["total"] += int(provider_stats.get("total", 0))
         stats_acc["in_region"] += int(provider_stats.get("in_region", 0))
         stats_acc["nearby"] += int(provider_stats.get("nearby", 0))
@@ -70,7 +80,7 @@ async def load_events_combined(
 
     # Если провайдеры не вернули разбиение — считаем по событиям
     if not by_category:
-        for ev in events:
+        for ev in iter_events(events):
             cid = (ev.get("categories") or [{}])[0].get("id", "manmade")
             by_category[cid] = by_category.get(cid, 0) + 1
 
@@ -85,3 +95,28 @@ async def load_events_combined(
         },
         "cached": False,
     }
+
+
+async def load_events_combined(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    status: str = "open",
+    bbox_str: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Комбинированные события; "events" — плоский список словарей."""
+    result = await _gather_events(start, end, status, bbox_str)
+    result["events"] = list(iter_events(result["events"]))
+    return result
+
+
+async def load_events_combined_json(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    status: str = "open",
+    bbox_str: Optional[str] = None,
+) -> bytes:
+    """
+    То же, что load_events_combined, но сразу в JSON: пачки EventColumns
+    сериализуются колонками, без промежуточных словарей.
+    """
+    return dumps_events_payload(await _gather_events(start, end, status, bbox_str))
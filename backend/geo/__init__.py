@@ -0,0 +1,11 @@
+"""Пространственные индексы для раздачи событий по нескольким AOI"""
+
+from backend.geo.filters import make_bbox_filter
+from backend.geo.index import AOIIndex, geohash_encode, geohash_bounds
+
+__all__ = [
+    "AOIIndex",
+    "geohash_encode",
+    "geohash_bounds",
+    "make_bbox_filter",
+]
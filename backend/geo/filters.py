@@ -0,0 +1,53 @@
+# backend/geo/filters.py
+"""
+Фильтры по bbox.
+
+С numba маска считается одним JIT-ядром уровня модуля: границы передаются
+аргументами, поэтому ядро компилируется один раз на процесс (и кэшируется на
+диске), а не на каждый новый bbox. Без numba — та же маска на NumPy.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Callable, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+BBox = Tuple[float, float, float, float]  # (minLon, minLat, maxLon, maxLat)
+BBoxFilter = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+__all__ = ["make_bbox_filter"]
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _bbox_mask(lons, lats, x1, y1, x2, y2):  # pragma: no cover - JIT
+        n = lons.size
+        m = np.empty(n, dtype=np.bool_)
+        for i in prange(n):
+            m[i] = (x1 <= lons[i] <= x2) and (y1 <= lats[i] <= y2)
+        return m
+else:
+    def _bbox_mask(lons, lats, x1, y1, x2, y2):
+        return (lons >= x1) & (lons <= x2) & (lats >= y1) & (lats <= y2)
+
+
+def _apply_bbox_mask(
+    x1: float, y1: float, x2: float, y2: float, lons: np.ndarray, lats: np.ndarray
+) -> np.ndarray:
+    return _bbox_mask(lons, lats, x1, y1, x2, y2)
+
+
+def make_bbox_filter(bbox: BBox) -> BBoxFilter:
+    """
+    Функция mask(lons, lats) -> bool-массив для заданного bbox.
+    NaN-координаты в маску не попадают.
+    """
+    x1, y1, x2, y2 = (float(v) for v in bbox)
+    return partial(_apply_bbox_mask, x1, y1, x2, y2)
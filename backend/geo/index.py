@@ -0,0 +1,212 @@
+# backend/geo/index.py
+"""
+Индекс зон интереса (AOI) для сопоставления событий с несколькими регионами.
+
+AOI (bbox областей/районов) хранятся в квадродереве: узел делится на четыре
+квадранта, когда в нём больше `capacity` прямоугольников; прямоугольник,
+пересекающий границу квадрантов, остаётся в родительском узле. Для точки события
+считается geohash (base32, глубина 6); кандидаты для ячейки geohash кэшируются,
+и точная проверка bbox выполняется только для них — вместо перебора
+«каждое событие × каждый регион».
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BBox = Tuple[float, float, float, float]  # (minLon, minLat, maxLon, maxLat)
+
+# Ограничение кэша кандидатов по ячейкам geohash (ячейка 6 символов ≈ 1.2 × 0.6 км)
+_CELL_CACHE_MAX = 65536
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_BASE32_INDEX = {c: i for i, c in enumerate(_BASE32)}
+
+WORLD: BBox = (-180.0, -90.0, 180.0, 90.0)
+
+
+def geohash_encode(lon: float, lat: float, precision: int = 6) -> str:
+    """Geohash точки (base32, `precision` символов)."""
+    lon_lo, lon_hi = -180.0, 180.0
+    lat_lo, lat_hi = -90.0, 90.0
+    chars = []
+    bits = 0
+    nbits = 0
+    even = True  # чётные биты — долгота
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        nbits += 1
+        if nbits == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            nbits = 0
+    return "".join(chars)
+
+
+def geohash_bounds(gh: str) -> BBox:
+    """Границы ячейки geohash: (minLon, minLat, maxLon, maxLat)."""
+    lon_lo, lon_hi = -180.0, 180.0
+    lat_lo, lat_hi = -90.0, 90.0
+    even = True
+    for c in gh:
+        cd = _BASE32_INDEX[c]
+        for shift in (4, 3, 2, 1, 0):
+            bit = (cd >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                if bit:
+                    lon_lo = mid
+                else:
+                    lon_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+    return lon_lo, lat_lo, lon_hi, lat_hi
+
+
+def _intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class _Node:
+    __slots__ = ("bounds", "depth", "items", "children")
+
+    def __init__(self, bounds: BBox, depth: int):
+        self.bounds = bounds
+        self.depth = depth
+        self.items: List[Tuple[str, BBox]] = []
+        self.children: Optional[List["_Node"]] = None
+
+    def _split(self) -> None:
+        x1, y1, x2, y2 = self.bounds
+        mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+        d = self.depth + 1
+        self.children = [
+            _Node((x1, y1, mx, my), d),
+            _Node((mx, y1, x2, my), d),
+            _Node((x1, my, mx, y2), d),
+            _Node((mx, my, x2, y2), d),
+        ]
+
+    def _child_containing(self, bbox: BBox) -> Optional["_Node"]:
+        """Квадрант, целиком содержащий bbox, или None, если bbox пересекает границу."""
+        for child in self.children:  # type: ignore[union-attr]
+            x1, y1, x2, y2 = child.bounds
+            if x1 <= bbox[0] and bbox[2] <= x2 and y1 <= bbox[1] and bbox[3] <= y2:
+                return child
+        return None
+
+
+class AOIIndex:
+    """
+    Квадродерево по bbox зон интереса.
+
+    Каждый прямоугольник хранится ровно в одном узле — самом глубоком, который
+    его целиком содержит, поэтому пересекающиеся AOI не размножаются по
+    квадрантам. Поиск проверяет элементы всех узлов на пути к ячейке.
+    """
+
+    def __init__(
+        self,
+        aois: Optional[Iterable[Tuple[str, BBox]]] = None,
+        capacity: int = 64,
+        max_depth: int = 16,
+        precision: int = 6,
+    ):
+        self.capacity = capacity
+        self.max_depth = max_depth
+        self.precision = precision
+        self._root = _Node(WORLD, 0)
+        self._size = 0
+        self._cell_cache: Dict[str, List[Tuple[str, BBox]]] = {}
+        for aoi_id, bbox in aois or ():
+            self.insert(aoi_id, bbox)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, aoi_id: str, bbox: BBox) -> None:
+        """Добавить AOI (bbox в порядке minLon, minLat, maxLon, maxLat)."""
+        bbox = tuple(float(v) for v in bbox)  # type: ignore[assignment]
+        self._insert(self._root, (aoi_id, bbox))
+        self._size += 1
+        self._cell_cache.clear()
+
+    def _insert(self, node: _Node, item: Tuple[str, BBox]) -> None:
+        while node.children is not None:
+            child = node._child_containing(item[1])
+            if child is None:
+                break
+            node = child
+
+        node.items.append(item)
+        self._maybe_split(node)
+
+    def _maybe_split(self, node: _Node) -> None:
+        if (
+            node.children is not None
+            or len(node.items) <= self.capacity
+            or node.depth >= self.max_depth
+        ):
+            return
+        node._split()
+        items, node.items = node.items, []
+        for it in items:
+            child = node._child_containing(it[1])
+            (child or node).items.append(it)
+        for child in node.children:  # type: ignore[union-attr]
+            self._maybe_split(child)
+
+    def _query_rect(self, rect: BBox) -> List[Tuple[str, BBox]]:
+        """Все AOI, bbox которых пересекает rect."""
+        out: List[Tuple[str, BBox]] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if not _intersects(node.bounds, rect):
+                continue
+            for item in node.items:
+                if _intersects(item[1], rect):
+                    out.append(item)
+            if node.children is not None:
+                stack.extend(node.children)
+        return out
+
+    def candidates(self, lon: float, lat: float) -> List[Tuple[str, BBox]]:
+        """AOI-кандидаты для ячейки geohash, в которую попала точка."""
+        gh = geohash_encode(lon, lat, self.precision)
+        cached = self._cell_cache.get(gh)
+        if cached is None:
+            if len(self._cell_cache) >= _CELL_CACHE_MAX:
+                self._cell_cache.clear()
+            cached = self._query_rect(geohash_bounds(gh))
+            self._cell_cache[gh] = cached
+        return cached
+
+    def match(self, lon: float, lat: float) -> List[str]:
+        """Идентификаторы AOI, bbox которых содержит точку (lon, lat)."""
+        return [
+            aoi_id
+            for aoi_id, (x1, y1, x2, y2) in self.candidates(lon, lat)
+            if x1 <= lon <= x2 and y1 <= lat <= y2
+        ]
@@ -0,0 +1,243 @@
+# backend/http_client.py
+"""
+Общий httpx.AsyncClient для внешних провайдеров (GDACS, USGS, CDSE, ...).
+
+Один клиент на процесс держит пул keep-alive соединений (HTTP/2), поэтому
+повторные запросы к тем же хостам не платят за TCP+TLS рукопожатие.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "get_http_client",
+    "warmup_http_client",
+    "close_http_client",
+    "resilient_get",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "is_stale_response",
+]
+
+USER_AGENT = "akmola-monitor/1.0"
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Вернуть общий AsyncClient (создаётся лениво при первом обращении).
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            headers={"User-Agent": USER_AGENT},
+        )
+    return _client
+
+
+async def warmup_http_client(urls: Iterable[str]) -> None:
+    """
+    Прогреть пул соединений: HEAD-запрос к каждому хосту, чтобы TLS-рукопожатие
+    прошло до первого пользовательского запроса. Ошибки не критичны.
+    """
+    client = get_http_client()
+
+    async def _ping(url: str) -> None:
+        try:
+            await client.head(url, timeout=5.0)
+        except Exception as e:
+            logger.debug("HTTP warmup failed for %s: %s", url, e)
+
+    await asyncio.gather(*(_ping(u) for u in urls))
+    logger.info("HTTP client warmed up")
+
+
+async def close_http_client() -> None:
+    """Закрыть общий клиент (при остановке приложения)."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+# ==========================
+# Ретраи и circuit breaker
+# ==========================
+
+class CircuitOpenError(httpx.HTTPError):
+    """Хост временно отключён breaker'ом, а сохранённого ответа нет."""
+
+
+class CircuitBreaker:
+    """
+    Простой circuit breaker на хост: после `failure_threshold` неудач подряд
+    запросы не выполняются `reset_timeout` секунд, затем один пробный
+    запрос (half-open) решает — закрыть цепь или снова открыть. Пока проба
+    в полёте, остальные запросы получают отказ, как при открытой цепи.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._probing:
+            return False
+        self._probing = True  # этот запрос — единственная проба
+        return True
+
+    def release_probe(self) -> None:
+        """Проба завершилась без вердикта (отмена, не-HTTP ошибка)."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class _RetryableStatus(httpx.HTTPStatusError):
+    """5xx — повод для повторной попытки."""
+
+
+RETRY_ATTEMPTS = 3
+LAST_GOOD_MAX = 32
+LAST_GOOD_MAX_AGE = 900.0  # старше 15 минут сохранённый ответ не отдаём
+
+_breakers: Dict[str, CircuitBreaker] = {}
+# URL -> (ответ, time.monotonic() на момент получения)
+_last_good: "OrderedDict[str, Tuple[httpx.Response, float]]" = OrderedDict()
+
+
+def is_stale_response(resp: httpx.Response) -> bool:
+    """True, если resilient_get отдал сохранённый ответ вместо свежего."""
+    return bool(resp.extensions.get("stale"))
+
+
+def _stale_copy(resp: httpx.Response, age: float) -> httpx.Response:
+    """
+    Копия сохранённого ответа с пометкой устаревания: заголовки Age и
+    Warning: 110 (RFC 7234) и extensions["stale"] для вызывающего кода.
+    """
+    headers = resp.headers.copy()
+    headers["Age"] = str(int(age))
+    headers["Warning"] = '110 - "Response is Stale"'
+    return httpx.Response(
+        resp.status_code,
+        headers=headers,
+        content=resp.content,
+        request=resp.request,
+        extensions={**resp.extensions, "stale": True},
+    )
+
+
+def _breaker_for(host: str) -> CircuitBreaker:
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker()
+    return breaker
+
+
+async def resilient_get(
+    url: str,
+    *,
+    client: Optional[httpx.AsyncClient] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    GET с повторами (3 попытки, экспоненциальная пауза 1..8 с с джиттером) на
+    сетевых ошибках и 5xx и с circuit breaker'ом по хосту. Пока цепь открыта,
+    сразу возвращается последний успешный ответ на тот же URL, если он не
+    старше LAST_GOOD_MAX_AGE; такой ответ помечен (см. is_stale_response).
+    4xx возвращаются как есть — их обрабатывает вызывающий код.
+    """
+    client = client or get_http_client()
+    request_url = httpx.URL(url, params=kwargs.get("params"))
+    key = str(request_url)
+    breaker = _breaker_for(request_url.host)
+
+    probe = breaker.state == "half-open"
+    if not breaker.allow():
+        cached = _last_good.get(key)
+        if cached is not None:
+            age = time.monotonic() - cached[1]
+            if age <= LAST_GOOD_MAX_AGE:
+                logger.warning(
+                    "Circuit open for %s, serving last good response (%.0fs old)",
+                    request_url.host, age,
+                )
+                return _stale_copy(cached[0], age)
+            del _last_good[key]
+        raise CircuitOpenError(f"Circuit open for {request_url.host}")
+
+    try:
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(RETRY_ATTEMPTS),
+            wait=wait_exponential_jitter(initial=1, max=8),
+            retry=retry_if_exception_type(httpx.HTTPError),
+            reraise=True,
+        ):
+            with attempt:
+                resp = await client.get(url, **kwargs)
+                if resp.status_code >= 500:
+                    raise _RetryableStatus(
+                        f"Server error {resp.status_code} for {key}",
+                        request=resp.request,
+                        response=resp,
+                    )
+    except _RetryableStatus as e:
+        breaker.record_failure()
+        return e.response
+    except httpx.HTTPError:
+        breaker.record_failure()
+        raise
+    finally:
+        if probe:
+            breaker.release_probe()
+
+    breaker.record_success()
+    if resp.status_code == 200:
+        _last_good[key] = (resp, time.monotonic())
+        _last_good.move_to_end(key)
+        while len(_last_good) > LAST_GOOD_MAX:
+            _last_good.popitem(last=False)
+    return resp
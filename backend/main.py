@@ -1,5 +1,6 @@
 # backend/main.py
 from pathlib import Path
+import asyncio
 import logging
 import os
 import re
@@ -7,16 +8,21 @@ import uuid
 from typing import List, Optional
 
 import httpx
+import orjson
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 
 from backend.api.registry import api_v1, pages_router
 from backend.settings import settings
 from backend.metrics import metrics_collector
 from backend.cache_monitor import CacheMonitor
 from backend.job_tracker import job_tracker, JobStatus
+from backend.http_client import warmup_http_client, close_http_client
+from backend.providers.gdacs import GDACS_URL
+from backend.providers.usgs_quakes import USGS_FDSN_URL
 
 # ==========================
 # Логирование
@@ -39,11 +45,23 @@ DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 # ==========================
 # FastAPI
 # ==========================
+class OrjsonResponse(Response):
+    """JSON-ответ через orjson (ORJSONResponse в FastAPI объявлен устаревшим)."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
 app = FastAPI(
     title="Akmola Sentinel API",
     description="API для мониторинга Акмолинской области с использованием данных Sentinel и NASA EONET",
     version="1.1.0",
     debug=DEBUG,
+    default_response_class=OrjsonResponse,
 )
 
 # ==========================
@@ -340,9 +358,9 @@ async def health():
     # 3. Check Redis/Celery (optional check, don't fail if not configured)
     redis_ok = None  # None means not checked/not applicable
     try:
-        import redis
-        r = redis.from_url(settings.CELERY_BROKER_URL, socket_connect_timeout=2)
-        r.ping()
+        from backend.tasks import get_broker_client
+        # Синхронный redis-клиент — не блокируем event loop
+        await run_in_threadpool(get_broker_client().ping)
         redis_ok = True
         health_checks["redis"] = {
             "url": settings.CELERY_BROKER_URL.split('@')[-1],  # Hide credentials
@@ -378,7 +396,7 @@ async def health():
     # 5. Cache statistics with monitoring
     cache_ok = True
     try:
-        cache_status = cache_monitor.get_cache_status()
+        cache_status = await run_in_threadpool(cache_monitor.get_cache_summary)
         health_checks["cache"] = {
             "status": cache_status["status"],
             "total_files": cache_status["total"]["files"],
@@ -563,6 +581,9 @@ async def startup_event():
     logger.info("BIOPAR_SH:      %s (files: %d)", BIOPAR_SH_CACHE_DIR, count_tifs(BIOPAR_SH_CACHE_DIR))
     logger.info("=" * 72)
 
+    # Прогреваем пул соединений к провайдерам событий в фоне, не задерживая старт
+    app.state.http_warmup = asyncio.create_task(warmup_http_client([GDACS_URL, USGS_FDSN_URL]))
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -570,6 +591,6 @@ async def shutdown_event():
     logger.info("=" * 72)
     logger.info("Shutting down Akmola Sentinel API...")
     logger.info("Performing cleanup...")
-    # Add any cleanup tasks here (close HTTP clients, flush caches, etc.)
+    await close_http_client()
     logger.info("Shutdown complete")
     logger.info("=" * 72)
\ No newline at end of file
@@ -14,10 +14,13 @@ import logging
 import os
 import time
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from dotenv import load_dotenv
+import functools
 import hashlib
 import json
+import sqlite3
+import threading
 import requests
 from enum import Enum
 
@@ -68,6 +71,78 @@ SH_PROCESS_URL = "https://sh.dataspace.copernicus.eu/api/v1/process"
 # Версия evalscript для кэш-инвалидации
 EVALSCRIPT_VERSION = "v2.0"
 
+# Индекс метаданных кэша: одна SQLite-база вместо .json на каждый GeoTIFF
+CACHE_INDEX_PATH = CACHE_DIR / "index.sqlite"
+_CACHE_INDEX_FILES = {"index.sqlite", "index.sqlite-wal", "index.sqlite-shm"}
+
+
+def _open_cache_index() -> sqlite3.Connection:
+    """
+    Открывает (и при необходимости создаёт) индекс метаданных кэша.
+
+    WAL-журнал позволяет читать индекс параллельно с записью и не делает
+    fsync на каждую вставку (synchronous=NORMAL).
+
+    Returns:
+        sqlite3.Connection: Соединение в autocommit-режиме
+    """
+    conn = sqlite3.connect(
+        str(CACHE_INDEX_PATH),
+        check_same_thread=False,
+        isolation_level=None,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ndvi_cache (
+            digest TEXT PRIMARY KEY,
+            bbox TEXT NOT NULL,
+            start TEXT NOT NULL,
+            end TEXT NOT NULL,
+            w INTEGER NOT NULL,
+            h INTEGER NOT NULL,
+            cloud INTEGER NOT NULL,
+            mosaic TEXT,
+            harmonize INTEGER NOT NULL,
+            mask INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            ts REAL NOT NULL,
+            ev_ver TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ndvi_cache_ts ON ndvi_cache (ts)")
+    return conn
+
+
+# Соединение используется из потоков FastAPI threadpool — сериализуем доступ.
+# Открывается лениво и своё в каждом процессе: SQLite-соединение нельзя
+# переносить через fork (воркеры uvicorn/Celery)
+_cache_index: Optional[sqlite3.Connection] = None
+_cache_index_pid: Optional[int] = None
+_cache_index_lock = threading.Lock()
+
+
+def _get_cache_index() -> sqlite3.Connection:
+    """Соединение с индексом кэша для текущего процесса (вызывать под _cache_index_lock)."""
+    global _cache_index, _cache_index_pid
+    pid = os.getpid()
+    if _cache_index is None or _cache_index_pid != pid:
+        _cache_index = _open_cache_index()
+        _cache_index_pid = pid
+    return _cache_index
+
+
+def _reset_cache_index_lock() -> None:
+    # Блокировку мог держать поток родителя в момент fork
+    global _cache_index_lock
+    _cache_index_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_cache_index_lock)
+
 
 class MosaickingOrder(str, Enum):
     """Типы упорядочивания мозаики согласно Sentinel Hub API."""
@@ -136,6 +211,7 @@ def get_cdse_token() -> str:
         raise AuthenticationError(f"Unexpected error: {e}")
 
 
+@functools.lru_cache(maxsize=8)
 def get_ndvi_evalscript(use_cloud_mask: bool = True, mosaicking: str = "SIMPLE") -> str:
     """
     Генерирует evalscript V3 для NDVI согласно документации Sentinel Hub.
@@ -205,6 +281,18 @@ function evaluatePixel(sample) {{
     return evalscript
 
 
+def _prewarm_evalscripts() -> None:
+    """
+    Evalscript не зависит от запроса (кроме маски) — рендерим заранее
+    только используемые варианты (fetch_ndvi_geotiff всегда берёт SIMPLE).
+    """
+    for use_cloud_mask in (True, False):
+        get_ndvi_evalscript(use_cloud_mask=use_cloud_mask, mosaicking="SIMPLE")
+
+
+_prewarm_evalscripts()
+
+
 def _cache_key(
     bbox: List[float],
     start_date: str,
@@ -253,6 +341,101 @@ def _cache_key(
     return f"ndvi_{digest}.tif"
 
 
+def _cache_digest(cache_name: str) -> str:
+    """Извлекает digest из имени файла кэша (ndvi_<digest>.tif)."""
+    return cache_name[len("ndvi_"):-len(".tif")]
+
+
+def _index_cache_entry(
+    digest: str,
+    bbox: List[float],
+    start_date: str,
+    end_date: str,
+    width: int,
+    height: int,
+    max_cloud_coverage: int,
+    mosaicking_order: Optional[str],
+    harmonize: bool,
+    use_cloud_mask: bool,
+    size: int
+) -> None:
+    """
+    Записывает метаданные запроса в SQLite-индекс кэша.
+
+    Метаданные не критичны: при ошибке записи логируем и продолжаем.
+    """
+    try:
+        with _cache_index_lock:
+            _get_cache_index().execute(
+                "INSERT OR REPLACE INTO ndvi_cache "
+                "(digest, bbox, start, end, w, h, cloud, mosaic, harmonize, mask, size, ts, ev_ver) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    digest,
+                    json.dumps(bbox),
+                    start_date,
+                    end_date,
+                    int(width),
+                    int(height),
+                    int(max_cloud_coverage),
+                    mosaicking_order,
+                    int(harmonize),
+                    int(use_cloud_mask),
+                    int(size),
+                    time.time(),
+                    EVALSCRIPT_VERSION,
+                ),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Could not save metadata: {e}")
+
+
+# Сигнатуры TIFF (little-endian / big-endian)
+TIFF_MAGIC = (b'II\x2a\x00', b'MM\x00\x2a')
+
+
+# Пустой/повреждённый TIFF обычно < 1KB
+MIN_VALID_SIZE = 1000
+
+
+class _InvalidPayload(Exception):
+    """Тело ответа 200 не похоже на GeoTIFF (слишком мало данных или нет сигнатуры)"""
+
+    def __init__(self, size: int, too_small: bool):
+        super().__init__(size)
+        self.size = size
+        self.too_small = too_small
+
+
+def _checked_chunks(resp: requests.Response) -> Iterator[bytes]:
+    """
+    Чанки тела ответа с попутной проверкой размера и сигнатуры TIFF.
+
+    Если тело оказалось слишком маленьким или без сигнатуры TIFF, в конце
+    (или сразу, как только это ясно) бросается _InvalidPayload — тогда
+    atomic_write_cache_stream удаляет временный файл и кэш не меняется.
+
+    Args:
+        resp: Ответ requests, открытый со stream=True
+
+    Yields:
+        bytes: Непустые чанки тела
+    """
+    size = 0
+    magic = b""
+    for chunk in resp.iter_content(chunk_size=1 << 20):
+        if not chunk:
+            continue
+        if len(magic) < 4:
+            magic += chunk[:4 - len(magic)]
+        size += len(chunk)
+        if size >= MIN_VALID_SIZE and magic not in TIFF_MAGIC:
+            raise _InvalidPayload(size, too_small=False)
+        yield chunk
+    if size < MIN_VALID_SIZE:
+        raise _InvalidPayload(size, too_small=True)
+
+
 def fetch_ndvi_geotiff(
     bbox: List[float],
     start_date: str,
@@ -410,9 +593,12 @@ def fetch_ndvi_geotiff(
 
     headers = {
         "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
+        "Content-Type": "application/json",
     }
 
+    # Тело запроса сериализуем один раз — повторные попытки шлют те же байты
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
     # Retry логика
     last_error = None
     
@@ -426,8 +612,9 @@ def fetch_ndvi_geotiff(
             resp = requests.post(
                 SH_PROCESS_URL,
                 headers=headers,
-                json=payload,
-                timeout=180
+                data=body,
+                timeout=180,
+                stream=True
             )
             
             logger.info(f"Processing API response status: {resp.status_code}")
@@ -462,6 +649,7 @@ def fetch_ndvi_geotiff(
                     else:
                         retry_after = _calculate_retry_delay(attempt, retry_delay, settings.RETRY_BACKOFF_FACTOR)
                     logger.warning(f"Rate limit exceeded, waiting {retry_after:.1f}s (attempt {attempt + 1}/{max_retries})...")
+                    resp.close()  # stream=True: вернуть соединение в пул
                     time.sleep(retry_after)
                     # Обновляем токен на случай его истечения
                     token = get_cdse_token()
@@ -477,6 +665,7 @@ def fetch_ndvi_geotiff(
                     logger.warning(
                         f"Server error {resp.status_code}, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})..."
                     )
+                    resp.close()
                     time.sleep(delay)
                     continue
                 else:
@@ -489,88 +678,63 @@ def fetch_ndvi_geotiff(
                 logger.error(f"Processing API error ({resp.status_code}): {resp.text}")
                 resp.raise_for_status()
             
-            # Успешный ответ - проверяем содержимое
-            content_length = len(resp.content)
-            
-            # GeoTIFF должен иметь минимальный размер
-            # Пустой/corrupted TIFF обычно < 1KB
-            MIN_VALID_SIZE = 1000
-            
-            if content_length < MIN_VALID_SIZE:
-                logger.warning(
-                    f"Suspiciously small response: {content_length} bytes "
-                    f"(expected > {MIN_VALID_SIZE})"
-                )
-                
-                if attempt < max_retries:
-                    delay = _calculate_retry_delay(attempt, retry_delay, settings.RETRY_BACKOFF_FACTOR)
-                    logger.warning(f"Retrying due to small response in {delay:.1f}s...")
-                    time.sleep(delay)
-                    continue
-                else:
+            # Успешный ответ - пишем тело в кэш атомарно, по частям
+            # (resp.content не материализуем); проверки — по ходу потока.
+            # Тело читается во временный файл без блокировки, блокировка
+            # каталога берётся только на rename
+            from backend.utils import atomic_write_cache_stream
+            try:
+                content_length = atomic_write_cache_stream(cache_path, _checked_chunks(resp))
+            except _InvalidPayload as bad:
+                if bad.too_small:
+                    logger.warning(
+                        f"Suspiciously small response: {bad.size} bytes "
+                        f"(expected > {MIN_VALID_SIZE})"
+                    )
+
+                    if attempt < max_retries:
+                        delay = _calculate_retry_delay(attempt, retry_delay, settings.RETRY_BACKOFF_FACTOR)
+                        logger.warning(f"Retrying due to small response in {delay:.1f}s...")
+                        time.sleep(delay)
+                        continue
                     raise NoDataAvailableError(
                         f"Received empty or corrupted data for {start_date}..{end_date}. "
                         f"This usually means no valid satellite data is available."
                     )
-            
-            # Проверяем, что это действительно TIFF
-            if not resp.content.startswith(b'II\x2a\x00') and \
-               not resp.content.startswith(b'MM\x00\x2a'):
+
                 logger.warning("Response doesn't appear to be a valid TIFF file")
-                
+
                 if attempt < max_retries:
                     delay = _calculate_retry_delay(attempt, retry_delay, settings.RETRY_BACKOFF_FACTOR)
                     logger.warning(f"Retrying due to invalid TIFF format in {delay:.1f}s...")
                     time.sleep(delay)
                     continue
-                else:
-                    raise SentinelHubError(
-                        "Received invalid TIFF data from API. "
-                        "This may indicate a server-side processing error."
-                    )
-            
-            # Сохраняем успешный результат атомарно
-            # Используем atomic_write_cache для предотвращения частичных записей
-            try:
-                from backend.utils import atomic_write_cache
-                atomic_write_cache(cache_path, resp.content, use_lock=True)
-                logger.info(
-                    f"NDVI saved: {cache_name}, size: {content_length:,} bytes"
+                raise SentinelHubError(
+                    "Received invalid TIFF data from API. "
+                    "This may indicate a server-side processing error."
                 )
-            except Exception as write_error:
-                # Очистка при ошибке записи
+            except requests.exceptions.RequestException:
+                raise  # обрыв потока — ретраи ниже (RequestException — подкласс OSError)
+            except TimeoutError as lock_error:
+                # Не ошибка записи: блокировку каталога кэша держит другой процесс
+                logger.error(f"Cache lock timeout for {cache_name}: {lock_error}")
+                raise SentinelHubError(f"Timed out waiting for NDVI cache lock: {lock_error}")
+            except OSError as write_error:
                 logger.error(f"Failed to write cache file: {write_error}")
-                if cache_path.exists():
-                    try:
-                        cache_path.unlink()
-                        logger.debug(f"Cleaned up partial cache file: {cache_path}")
-                    except Exception as cleanup_error:
-                        logger.warning(f"Could not clean up cache file: {cleanup_error}")
                 raise SentinelHubError(f"Failed to save GeoTIFF: {write_error}")
-            
-            # Сохраняем метаданные запроса для отладки
-            metadata_path = cache_path.with_suffix('.json')
-            metadata = {
-                "bbox": bbox,
-                "start_date": start_date,
-                "end_date": end_date,
-                "width": width,
-                "height": height,
-                "max_cloud_coverage": max_cloud_coverage,
-                "mosaicking_order": mosaic_str,
-                "harmonize_values": harmonize_values,
-                "use_cloud_mask": use_cloud_mask,
-                "file_size_bytes": content_length,
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "evalscript_version": EVALSCRIPT_VERSION
-            }
+            finally:
+                resp.close()
 
-            try:
-                with open(metadata_path, "w") as f:
-                    json.dump(metadata, f, indent=2)
-            except Exception as meta_error:
-                # Метаданные не критичны, логируем и продолжаем
-                logger.warning(f"Could not save metadata: {meta_error}")
+            logger.info(
+                f"NDVI saved: {cache_name}, size: {content_length:,} bytes"
+            )
+
+            # Сохраняем метаданные запроса для отладки
+            _index_cache_entry(
+                _cache_digest(cache_name), bbox, start_date, end_date,
+                width, height, max_cloud_coverage, mosaic_str,
+                harmonize_values, use_cloud_mask, content_length
+            )
 
             return cache_path
 
@@ -646,14 +810,28 @@ def clear_cache(older_than_days: Optional[int] = None) -> int:
     if older_than_days:
         cutoff_time = time.time() - (older_than_days * 86400)
     
+    from backend.utils import LOCK_NAME, remove_cache_file
+
     for file_path in CACHE_DIR.glob("*"):
+        if file_path.name in _CACHE_INDEX_FILES or file_path.name == LOCK_NAME:
+            continue
         if file_path.is_file():
             if cutoff_time is None or file_path.stat().st_mtime < cutoff_time:
                 try:
-                    file_path.unlink()
+                    remove_cache_file(file_path)
                     deleted += 1
                 except Exception as e:
                     logger.warning(f"Failed to delete {file_path}: {e}")
+
+    # Индекс чистим одним запросом (ts — время записи GeoTIFF)
+    try:
+        with _cache_index_lock:
+            _get_cache_index().execute(
+                "DELETE FROM ndvi_cache WHERE ts < ?",
+                (cutoff_time if cutoff_time is not None else float("inf"),),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to clean cache index: {e}")
     
     logger.info(f"Cache cleanup: deleted {deleted} files")
     return deleted
\ No newline at end of file
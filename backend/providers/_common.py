@@ -0,0 +1,108 @@
+# backend/providers/_common.py
+"""
+Общий конвейер провайдеров событий (GDACS, GDACS RSS, USGS).
+
+Каждый провайдер сам отбирает записи (bbox/даты) и описывает одну запись
+кортежем EventRow; здесь за один проход строятся словари нашего контракта
+и вся статистика {"events": [...], "stats": {...}}.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "EventRow", "SAMPLE_LIMIT", "normalize", "make_stats", "sample_coordinates", "empty_result",
+]
+
+# (id, title, description, link, category_id, category_title, lon, lat, date_iso)
+EventRow = Tuple[str, str, str, str, str, str, float, float, Optional[str]]
+
+SAMPLE_LIMIT = 10
+
+
+def sample_coordinates(points: Iterable[Tuple[str, float, float]]) -> List[Dict[str, Any]]:
+    """Первые SAMPLE_LIMIT точек (title, lon, lat) для логов/диагностики."""
+    out: List[Dict[str, Any]] = []
+    for title, lon, lat in points:
+        if len(out) >= SAMPLE_LIMIT:
+            break
+        out.append({"title": title[:50], "coords": [lon, lat], "distance_deg": 0.0})
+    return out
+
+
+def make_stats(
+    total: int,
+    in_region: int,
+    by_category: Dict[str, int],
+    samples: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    return {
+        "total": total,
+        "in_region": in_region,
+        "nearby": 0,  # «nearby» провайдеры не считают
+        "by_category": by_category,
+        "sample_coordinates": samples,
+    }
+
+
+def empty_result(total: int = 0) -> Dict[str, Any]:
+    return {"events": [], "stats": make_stats(total, 0, {}, [])}
+
+
+def normalize(
+    items: Sequence[Any],
+    *,
+    source: str,
+    row_fn: Callable[[Any], Optional[EventRow]],
+    total: Optional[int] = None,
+    extra_fn: Optional[Callable[[Any], Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Прогнать отобранные записи через row_fn и собрать ответ провайдера.
+    Запись, для которой row_fn вернул None или упал, пропускается.
+    extra_fn — дополнительные поля события (например, "aoi_ids").
+    total — сколько записей было в ответе источника (по умолчанию len(items)).
+    """
+    # Размер известен заранее: пишем по индексу, пропуски отсеем в конце
+    events: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    cat_counter: Counter = Counter()
+    samples: List[Dict[str, Any]] = []
+
+    for k, it in enumerate(items):
+        try:
+            row = row_fn(it)
+        except Exception:
+            continue
+        if row is None:
+            continue
+
+        ev_id, title, description, link, cat_id, cat_title, lon, lat, date_iso = row
+        ev = {
+            "id": ev_id,
+            "title": title,
+            "description": description,
+            "link": link,
+            "categories": [{"id": cat_id, "title": cat_title}],
+            "geometry": [{
+                "type": "Point",
+                "coordinates": [lon, lat],
+                "date": date_iso,
+            }],
+            "sources": [{"id": source}],
+            "closed": None,
+        }
+        if extra_fn is not None:
+            ev.update(extra_fn(it))
+        events[k] = ev
+        cat_counter[cat_id] += 1
+
+        if len(samples) < SAMPLE_LIMIT:
+            samples.append({"title": title[:50], "coords": [lon, lat], "distance_deg": 0.0})
+
+    out = [ev for ev in events if ev is not None]
+    stats = make_stats(
+        len(items) if total is None else total, len(out), dict(cat_counter), samples
+    )
+    return {"events": out, "stats": stats}
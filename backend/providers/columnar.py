@@ -0,0 +1,136 @@
+# backend/providers/columnar.py
+"""
+Колоночное (SoA) представление точечных событий.
+
+Провайдер с большим числом однотипных событий (USGS) хранит поля в отдельных
+колонках вместо списка словарей по ~10 ключей. Словарь события собирается
+только при обращении (совместимость с кодом, ожидающим List[Dict]), а для
+ответа API события сериализуются напрямую из колонок через orjson.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import orjson
+
+__all__ = ["EventColumns", "iter_events", "dumps_events_payload"]
+
+
+class EventColumns(Sequence):
+    """
+    Пачка точечных событий одного источника и одной категории в виде колонок.
+    Ведёт себя как последовательность словарей нашего общего контракта.
+    """
+
+    __slots__ = (
+        "ids", "titles", "descriptions", "links", "lons", "lats", "dates",
+        "category_id", "category_title", "source",
+    )
+
+    def __init__(
+        self,
+        ids: List[str],
+        titles: List[str],
+        descriptions: List[str],
+        links: List[str],
+        lons: np.ndarray,
+        lats: np.ndarray,
+        dates: List[Optional[str]],
+        category_id: str,
+        category_title: str,
+        source: str,
+    ):
+        self.ids = ids
+        self.titles = titles
+        self.descriptions = descriptions
+        self.links = links
+        self.lons = lons
+        self.lats = lats
+        self.dates = dates
+        self.category_id = category_id
+        self.category_title = category_title
+        self.source = source
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._row(k, float(self.lons[k]), float(self.lats[k])) for k in range(len(self))[i]]
+        if i < 0:
+            i += len(self)
+        return self._row(i, float(self.lons[i]), float(self.lats[i]))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i, lon, lat in zip(range(len(self)), self.lons.tolist(), self.lats.tolist()):
+            yield self._row(i, lon, lat)
+
+    def _row(self, i: int, lon: float, lat: float) -> Dict[str, Any]:
+        return {
+            "id": self.ids[i],
+            "title": self.titles[i],
+            "description": self.descriptions[i],
+            "link": self.links[i],
+            "categories": [{"id": self.category_id, "title": self.category_title}],
+            "geometry": [{
+                "type": "Point",
+                "coordinates": [lon, lat],
+                "date": self.dates[i],
+            }],
+            "sources": [{"id": self.source}],
+            "closed": None,
+        }
+
+    def iter_json(self) -> Iterator[bytes]:
+        """
+        JSON каждого события прямо из колонок: общие части (категория,
+        источник) кодируются один раз, на строку — только её поля.
+        """
+        head = (
+            b',"categories":' + orjson.dumps([{"id": self.category_id, "title": self.category_title}])
+            + b',"geometry":[{"type":"Point","coordinates":'
+        )
+        tail = b'}],"sources":' + orjson.dumps([{"id": self.source}]) + b',"closed":null}'
+        dumps = orjson.dumps
+        for id_, title, desc, link, lon, lat, date in zip(
+            self.ids, self.titles, self.descriptions, self.links,
+            self.lons.tolist(), self.lats.tolist(), self.dates,
+        ):
+            yield b"".join((
+                b'{"id":', dumps(id_),
+                b',"title":', dumps(title),
+                b',"description":', dumps(desc),
+                b',"link":', dumps(link),
+                head, dumps([lon, lat]),
+                b',"date":', dumps(date),
+                tail,
+            ))
+
+
+def iter_events(events: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """Плоский обход списка, где вперемешку словари и пачки EventColumns."""
+    for ev in events:
+        if isinstance(ev, EventColumns):
+            yield from ev
+        else:
+            yield ev
+
+
+def dumps_events_payload(payload: Dict[str, Any]) -> bytes:
+    """
+    Сериализовать ответ {"events": [...], ...} в JSON. Элементы "events" —
+    словари или пачки EventColumns (разворачиваются в массив объектов).
+    """
+    parts: List[bytes] = []
+    for ev in payload.get("events") or []:
+        if isinstance(ev, EventColumns):
+            parts.extend(ev.iter_json())
+        else:
+            parts.append(orjson.dumps(ev))
+    rest = {k: v for k, v in payload.items() if k != "events"}
+    body = orjson.dumps(rest, option=orjson.OPT_SERIALIZE_NUMPY)
+    events_json = b'{"events":[' + b",".join(parts) + b"]"
+    return events_json + (b"," + body[1:] if len(body) > 2 else b"}")
@@ -2,106 +2,118 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
 import httpx
+import numpy as np
+import orjson
+
+from backend.geo.filters import make_bbox_filter
+from backend.geo.index import AOIIndex
+from backend.http_client import get_http_client, resilient_get
+from backend.providers._common import empty_result, normalize
 
 logger = logging.getLogger(__name__)
 
-# Простая карта типов GDACS -> наши категории
-GDACS_MAP = {
+# Простая карта типов GDACS -> наши категории (только для чтения)
+GDACS_MAP = MappingProxyType({
     "EQ": "earthquakes",
     "TC": "severeStorms",   # Tropical Cyclone -> Штормы
     "FL": "floods",
     "VO": "manmade",        # (можно вынести в volcanoes, если добавите категорию)
     "WF": "wildfires",
     "DR": "drought",
-}
+})
 
 # API: список событий в периоде
 GDACS_URL = "https://www.gdacs.org/gdacsapi/api/events/geteventlist"
 
-def _within_bbox(lon: float, lat: float, bbox: Tuple[float, float, float, float]) -> bool:
-    x1, y1, x2, y2 = bbox
-    return x1 <= lon <= x2 and y1 <= lat <= y2
+_NAN_LONLAT = (float("nan"), float("nan"))
+
+def _safe_lonlat(it: Any) -> Tuple[float, float]:
+    """(lon, lat) события GDACS; (nan, nan), если координаты не читаются."""
+    try:
+        # GDACS может вернуться как FeatureCollection или список словарей — поддержим оба
+        if isinstance(it, dict) and it.get("type") == "Feature":
+            coords = ((it.get("geometry") or {}).get("coordinates") or [None, None])
+            return float(coords[0]), float(coords[1])
+        return float(it.get("lon")), float(it.get("lat"))
+    except Exception:
+        return _NAN_LONLAT
 
 async def load_gdacs(
     start: Optional[str],
     end: Optional[str],
     bbox: Tuple[float, float, float, float],
+    client: Optional[httpx.AsyncClient] = None,
+    aois: Optional[AOIIndex] = None,
 ) -> Dict[str, Any]:
     """
     Возвращает события GDACS в нашем общем контракте.
+    client — общий AsyncClient (по умолчанию процессный из backend.http_client).
+    aois — индекс нескольких зон интереса; если задан, фильтр идёт по нему
+    (вместо bbox), а у события появляется поле "aoi_ids".
     """
     params = {}
     if start: params["fromdate"] = start
     if end:   params["todate"]   = end
 
+    client = client or get_http_client()
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-            resp = await client.get(GDACS_URL, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await resilient_get(GDACS_URL, client=client, params=params, timeout=30.0)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
     except Exception as e:
         logger.warning("GDACS fetch failed: %s", e)
-        return {"events": [], "stats": {"total": 0, "in_region": 0, "nearby": 0, "by_category": {}, "sample_coordinates": []}}
+        return empty_result()
 
     items = data.get("features", []) or data.get("events", []) or []
-    events: List[Dict[str, Any]] = []
-    stats = {"total": 0, "in_region": 0, "nearby": 0, "by_category": {}, "sample_coordinates": []}
-
-    for it in items:
-        stats["total"] += 1
-        try:
-            # GDACS может вернуться как FeatureCollection или список словарей — поддержим оба
-            if isinstance(it, dict) and it.get("type") == "Feature":
-                props = it.get("properties", {}) or {}
-                geom = it.get("geometry", {}) or {}
-                coords = (geom.get("coordinates") or [None, None])
-                lon, lat = float(coords[0]), float(coords[1])
-                evtype = str(props.get("eventtype") or props.get("eventtypecode") or "").upper()
-                title  = props.get("eventname") or props.get("title") or "GDACS Event"
-                date_iso = props.get("fromdate") or props.get("alertdate") or None
-                link = props.get("url") or props.get("eventurl") or "https://www.gdacs.org/"
-
-            else:
-                # упрощённый фолбэк (некоторые ответы бывают с полями напрямую)
-                props = it
-                lon, lat = float(props.get("lon")), float(props.get("lat"))
-                evtype  = str(props.get("eventtype") or "").upper()
-                title   = props.get("eventname") or props.get("title") or "GDACS Event"
-                date_iso = props.get("fromdate") or props.get("alertdate") or None
-                link    = props.get("url") or "https://www.gdacs.org/"
-
-            if not _within_bbox(lon, lat, bbox):
-                continue
-
-            cat = GDACS_MAP.get(evtype, "manmade")
-            ev = {
-                "id": f"gdacs_{props.get('eventid') or props.get('id') or f'{evtype}_{lon}_{lat}'}",
-                "title": title,
-                "description": props.get("description") or "",
-                "link": link,
-                "categories": [{"id": cat, "title": evtype}],
-                "geometry": [{
-                    "type": "Point",
-                    "coordinates": [lon, lat],
-                    "date": date_iso,
-                }],
-                "sources": [{"id": "GDACS"}],
-                "closed": None,
-            }
-            events.append(ev)
-            stats["in_region"] += 1
-            stats["by_category"][cat] = stats["by_category"].get(cat, 0) + 1
-
-            if len(stats["sample_coordinates"]) < 10:
-                stats["sample_coordinates"].append({
-                    "title": title[:50],
-                    "coords": [lon, lat],
-                    "distance_deg": 0.0
-                })
+    # Фильтр по bbox одной векторной маской; NaN (битые координаты) не проходят
+    lonlat = np.fromiter(
+        (v for it in items for v in _safe_lonlat(it)), dtype=np.float64, count=2 * len(items)
+    ).reshape(-1, 2)
+    lons = np.ascontiguousarray(lonlat[:, 0])
+    lats = np.ascontiguousarray(lonlat[:, 1])
+    if aois is not None:
+        # Несколько AOI: спуск по квадродереву вместо перебора регионов
+        hits = {
+            i: ids for i, (lon, lat) in enumerate(lonlat.tolist())
+            if lon == lon and lat == lat and (ids := aois.match(lon, lat))
+        }
+        survivors = list(hits)
+    else:
+        mask = make_bbox_filter(bbox)(lons, lats)
+        survivors = np.flatnonzero(mask).tolist()
 
-        except Exception:
-            continue
+    def _row(i: int):
+        it = items[i]
+        lon, lat = float(lons[i]), float(lats[i])
+        if it.get("type") == "Feature":
+            props = it.get("properties", {}) or {}
+            evtype = sys.intern(str(props.get("eventtype") or props.get("eventtypecode") or "").upper())
+            link = props.get("url") or props.get("eventurl") or "https://www.gdacs.org/"
+        else:
+            # упрощённый фолбэк (некоторые ответы бывают с полями напрямую)
+            props = it
+            evtype = sys.intern(str(props.get("eventtype") or "").upper())
+            link = props.get("url") or "https://www.gdacs.org/"
+        return (
+            f"gdacs_{props.get('eventid') or props.get('id') or f'{evtype}_{lon}_{lat}'}",
+            props.get("eventname") or props.get("title") or "GDACS Event",
+            props.get("description") or "",
+            link,
+            GDACS_MAP.get(evtype, "manmade"),
+            evtype,
+            lon,
+            lat,
+            props.get("fromdate") or props.get("alertdate") or None,
+        )
 
-    return {"events": events, "stats": stats}
+    return normalize(
+        survivors,
+        source="GDACS",
+        row_fn=_row,
+        total=len(items),
+        extra_fn=(lambda i: {"aoi_ids": hits[i]}) if aois is not None else None,
+    )
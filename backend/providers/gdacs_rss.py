@@ -1,12 +1,20 @@
 # backend/providers/gdacs_rss.py
 from __future__ import annotations
 
+import calendar
+import io
+import re
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from email.utils import mktime_tz, parsedate_tz
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import datetime as dt
 
 import httpx
-import feedparser
+from lxml import etree
+
+from backend.geo.index import AOIIndex
+from backend.http_client import get_http_client, resilient_get
+from backend.providers._common import SAMPLE_LIMIT, normalize, sample_coordinates
 
 # Официальная глобальная лента GDACS (RSS/Atom). Есть и типовые фиды, но глобальная — простейшая.
 GDACS_RSS_URL = "https://www.gdacs.org/xml/rss.xml"
@@ -22,6 +30,21 @@ GDACS_TO_CATEGORY = {
     # Остальные редкие типы можно также маппить в manmade
 }
 
+# Классификатор категорий: все ключевые слова в одной регулярке, категория —
+# имя сработавшей группы (один проход по строке вместо десятка `in`)
+_CAT_RE = re.compile(
+    r"(?P<floods>flood)"
+    r"|(?P<severeStorms>cyclone|storm|hurricane|typhoon)"
+    r"|(?P<wildfires>wildfire|fire)"
+    r"|(?P<earthquakes>earthquake)"
+    r"|(?P<manmade>volcano)"
+    r"|(?P<drought>drought)",
+    re.IGNORECASE,
+)
+
+# Пространство имён W3C Basic Geo (geo:lat / geo:long внутри <item>)
+GEO_NS = "http://www.w3.org/2003/01/geo/wgs84_pos#"
+
 def _within_bbox(lon: float, lat: float, bbox: Tuple[float, float, float, float]) -> bool:
     x1, y1, x2, y2 = bbox
     return x1 <= lon <= x2 and y1 <= lat <= y2
@@ -31,78 +54,118 @@ def _parse_time(s: Optional[str]) -> Optional[str]:
     if not s:
         return None
     try:
-        # feedparser уже распарсит в struct_time entry.published_parsed
+        # s — struct_time в UTC (см. _parse_pubdate)
         return dt.datetime(*s[:6], tzinfo=dt.timezone.utc).isoformat()
     except Exception:
         return None
 
-def _to_category(entry: Any) -> str:
-    # В RSS у GDACS есть собственные namespace-поля, но feedparser не всегда даёт их как отдельные ключи.
-    # Поэтому используем эвристику: сначала ищем code в тегах, потом — по словам в заголовке.
-    # Теги: entry.tags -> [{'term': 'Flood', 'scheme': ...}, ...]
+def _parse_pubdate(s: Optional[str]) -> Optional[time.struct_time]:
+    """RFC 822 pubDate -> struct_time в UTC (как published_parsed у feedparser)."""
+    if not s:
+        return None
     try:
-        for t in entry.get("tags", []):
-            term = (t.get("term") or "").lower()
-            if "flood" in term: return "floods"
-            if "cyclone" in term or "storm" in term or "hurricane" in term or "typhoon" in term: return "severeStorms"
-            if "wildfire" in term or "fire" in term: return "wildfires"
-            if "earthquake" in term: return "earthquakes"
-            if "volcano" in term: return "manmade"
-            if "drought" in term: return "drought"
+        parsed = parsedate_tz(s.strip())
+        return time.gmtime(mktime_tz(parsed)) if parsed else None
     except Exception:
-        pass
+        return None
 
-    title = (entry.get("title") or "").lower()
-    if "flood" in title: return "floods"
-    if any(w in title for w in ["cyclone", "storm", "hurricane", "typhoon"]): return "severeStorms"
-    if any(w in title for w in ["wildfire", "fire"]): return "wildfires"
-    if "earthquake" in title: return "earthquakes"
-    if "volcano" in title: return "manmade"
-    if "drought" in title: return "drought"
-    return "manmade"
+def _iter_items(feed_bytes: bytes, limit: int) -> Iterator[Dict[str, Any]]:
+    """
+    Потоково разбирает RSS через lxml.iterparse: обрабатываем только события
+    конца <item>, забираем нужные поля и сразу освобождаем элемент.
+    Ключи словаря совпадают с полями entry у feedparser.
+    """
+    ctx = etree.iterparse(io.BytesIO(feed_bytes), events=("end",), tag="item", recover=True)
+    for count, (_, elem) in enumerate(ctx):
+        if count >= limit:
+            break
+
+        entry: Dict[str, Any] = {"tags": []}
+        for child in elem:
+            if not isinstance(child.tag, str):
+                continue  # комментарии / processing instructions
+            name = etree.QName(child).localname
+            text = (child.text or "").strip()
+            if name == "title":
+                entry["title"] = text
+            elif name == "link":
+                entry["link"] = text
+            elif name == "guid":
+                entry["id"] = text
+            elif name == "description":
+                entry["summary"] = text
+            elif name == "pubDate":
+                entry["published_parsed"] = _parse_pubdate(text)
+            elif name == "category" and text:
+                entry["tags"].append({"term": text})
+
+        # geo:lat / geo:long могут лежать внутри geo:Point
+        for node in elem.iter(f"{{{GEO_NS}}}lat", f"{{{GEO_NS}}}long"):
+            key = "geo_lat" if etree.QName(node).localname == "lat" else "geo_long"
+            entry[key] = (node.text or "").strip() or None
+
+        # Освобождаем память: сам элемент и уже обработанных соседей
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+        yield entry
+
+def _to_category(entry: Any) -> str:
+    # Эвристика: сначала ищем code в тегах (<category>), потом — по словам в заголовке.
+    # Теги: entry["tags"] -> [{'term': 'Flood'}, ...]
+    tags = " ".join(t.get("term") or "" for t in entry.get("tags", []))
+    m = _CAT_RE.search(tags) or _CAT_RE.search(entry.get("title") or "")
+    return m.lastgroup if m else "manmade"
 
 async def fetch_gdacs_rss(
     start: Optional[str],
     end: Optional[str],
     bbox: Tuple[float, float, float, float],
     limit: int = 500,
+    client: Optional[httpx.AsyncClient] = None,
+    aois: Optional[AOIIndex] = None,
 ) -> Dict[str, Any]:
     """
     Возвращает события из GDACS RSS, отфильтрованные по датам и bbox.
     Выходной формат совместим с фронтом: {"events": [...], "stats": {...}}
+    client — общий AsyncClient (по умолчанию процессный из backend.http_client).
+    aois — индекс нескольких зон интереса; если задан, фильтр идёт по нему
+    (вместо bbox), а у события появляется поле "aoi_ids".
     """
     # Политика таймаутов/ретраев простая — RSS лёгкий
-    async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-        resp = await client.get(GDACS_RSS_URL, headers={"User-Agent": "akmola-monitor/1.0"})
-        resp.raise_for_status()
-        feed_text = resp.text
-
-    parsed = feedparser.parse(feed_text)
-    entries = parsed.get("entries", [])[:limit]
-
-    # Дата-фильтр
-    start_dt = dt.datetime.fromisoformat(start) if start else None
-    end_dt = dt.datetime.fromisoformat(end) if end else None
-
-    events_out: List[Dict[str, Any]] = []
-    stats = {
-        "total": 0,
-        "in_region": 0,
-        "nearby": 0,  # для RSS «nearby» не считаем, оставляем 0
-        "by_category": {},
-        "sample_coordinates": [],
-    }
+    client = client or get_http_client()
+    resp = await resilient_get(GDACS_RSS_URL, client=client, timeout=30.0)
+    resp.raise_for_status()
+
+    entries = _iter_items(resp.content, limit)
+
+    # Дата-фильтр: границы считаем один раз и сравниваем секунды эпохи (UTC);
+    # конец периода включительно — до конца суток end
+    start_epoch = (
+        int(dt.datetime.fromisoformat(start).replace(tzinfo=dt.timezone.utc).timestamp())
+        if start else None
+    )
+    end_epoch = (
+        int(dt.datetime.fromisoformat(end).replace(tzinfo=dt.timezone.utc).timestamp()) + 86400
+        if end else None
+    )
+
+    # Отбор: даты -> координаты -> область; остальное делает общий конвейер
+    survivors: List[Tuple[int, Dict[str, Any], float, float, List[str]]] = []
+    located: List[Tuple[str, float, float]] = []  # примеры координат для логов
+    total = 0
 
     for e in entries:
-        stats["total"] += 1
+        total += 1
 
         # Время публикации / обновления
         pub_parsed = e.get("published_parsed") or e.get("updated_parsed")
-        if pub_parsed and (start_dt or end_dt):
-            pub = dt.datetime(*pub_parsed[:6], tzinfo=dt.timezone.utc)
-            if start_dt and pub < start_dt.replace(tzinfo=dt.timezone.utc):
+        if pub_parsed and (start_epoch is not None or end_epoch is not None):
+            pub = calendar.timegm(pub_parsed[:9])
+            if start_epoch is not None and pub < start_epoch:
                 continue
-            if end_dt and pub > end_dt.replace(tzinfo=dt.timezone.utc) + dt.timedelta(days=1):
+            if end_epoch is not None and pub > end_epoch:
                 continue
 
         # Координаты
@@ -112,38 +175,46 @@ async def fetch_gdacs_rss(
         except Exception:
             lat = lon = None
 
-        in_bbox = False
-        geometry = []
-        if lat is not None and lon is not None and _within_bbox(lon, lat, bbox):
-            in_bbox = True
-            geometry = [{
-                "type": "Point",
-                "coordinates": [lon, lat],
-                "date": _parse_time(pub_parsed)  # для попапа
-            }]
+        if lat is None or lon is None:
+            continue
 
+        # соберём немного примеров координат для логов (по всем точкам, не только в bbox)
+        if len(located) < SAMPLE_LIMIT:
+            located.append((e.get("title") or "", lon, lat))
+
+        # Сначала дешёвые фильтры по области, классификация — только для прошедших
+        aoi_ids: List[str] = []
+        if aois is not None:
+            aoi_ids = aois.match(lon, lat)
+            if not aoi_ids:
+                continue
+        elif not _within_bbox(lon, lat, bbox):
+            continue
+
+        survivors.append((total, e, lon, lat, aoi_ids))
+
+    def _row(s):
+        n, e, lon, lat, _ = s
         category_id = _to_category(e)
-        if in_bbox and geometry:
-            stats["in_region"] += 1
-            stats["by_category"][category_id] = stats["by_category"].get(category_id, 0) + 1
-
-            events_out.append({
-                "id": e.get("id") or e.get("link") or f"gdacs_{stats['total']}",
-                "title": e.get("title") or "GDACS Event",
-                "description": (e.get("summary") or "").strip(),
-                "link": e.get("link") or "",
-                "categories": [{"id": category_id, "title": category_id}],
-                "geometry": geometry,
-                "sources": [{"id": "GDACS"}],
-                "closed": None,
-            })
-
-        # соберём немного примеров координат для логов
-        if (lat is not None and lon is not None) and len(stats["sample_coordinates"]) < 10:
-            stats["sample_coordinates"].append({
-                "title": (e.get("title") or "")[:50],
-                "coords": [lon, lat],
-                "distance_deg": 0.0,  # не считаем для RSS
-            })
-
-    return {"events": events_out, "stats": stats}
+        pub_parsed = e.get("published_parsed") or e.get("updated_parsed")
+        return (
+            e.get("id") or e.get("link") or f"gdacs_{n}",
+            e.get("title") or "GDACS Event",
+            (e.get("summary") or "").strip(),
+            e.get("link") or "",
+            category_id,
+            category_id,
+            lon,
+            lat,
+            _parse_time(pub_parsed),  # для попапа
+        )
+
+    result = normalize(
+        survivors,
+        source="GDACS",
+        row_fn=_row,
+        total=total,
+        extra_fn=(lambda s: {"aoi_ids": s[4]}) if aois is not None else None,
+    )
+    result["stats"]["sample_coordinates"] = sample_coordinates(located)
+    return result
@@ -1,11 +1,17 @@
 # backend/providers/usgs_quakes.py
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 import datetime as dt
 import logging
 
 import httpx
+import numpy as np
+import orjson
+
+from backend.http_client import get_http_client, resilient_get
+from backend.providers._common import SAMPLE_LIMIT, make_stats, sample_coordinates
+from backend.providers.columnar import EventColumns
 
 logger = logging.getLogger(__name__)
 
@@ -30,11 +36,14 @@ async def fetch_quakes_bbox(
     bbox: Tuple[float, float, float, float],
     min_magnitude: float = 2.5,
     limit: int = 2000,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Dict[str, Any]:
     """
     Получить землетрясения USGS, отфильтрованные по bbox и датам.
     Возвращает формат, совместимый с фронтом:
-      {"events":[...], "stats":{...}}
+      {"events": EventColumns, "stats":{...}}
+    (EventColumns — последовательность словарей событий, хранимая колонками).
+    client — общий AsyncClient (по умолчанию процессный из backend.http_client).
     """
     minlon, minlat, maxlon, maxlat = bbox
 
@@ -53,65 +62,64 @@ async def fetch_quakes_bbox(
     # удалим None, чтобы не засорять URL
     params = {k: v for k, v in params.items() if v is not None}
 
-    async with httpx.AsyncClient(timeout=httpx.Timeout(45.0)) as client:
-        resp = await client.get(USGS_FDSN_URL, params=params, headers={"User-Agent": "akmola-monitor/1.0"})
-        resp.raise_for_status()
-        data = resp.json()
+    client = client or get_http_client()
+    resp = await resilient_get(USGS_FDSN_URL, client=client, params=params, timeout=45.0)
+    resp.raise_for_status()
+    data = orjson.loads(resp.content)
 
     features = data.get("features", []) or []
 
-    events_out: List[Dict[str, Any]] = []
-    stats = {
-        "total": len(features),
-        "in_region": 0,   # т.к. уже отфильтровано по bbox на стороне API, считаем все как in_region
-        "nearby": 0,
-        "by_category": {},
-        "sample_coordinates": [],
-    }
-
-    for i, feat in enumerate(features):
-        geom = feat.get("geometry") or {}
-        props = feat.get("properties") or {}
-        coords = geom.get("coordinates") or []
-        if len(coords) < 2:
-            continue
-
-        lon, lat = float(coords[0]), float(coords[1])
-        # время события от USGS (миллисекунды от эпохи)
-        t_ms = props.get("time")
-        date_iso = None
-        if isinstance(t_ms, (int, float)):
-            date_iso = dt.datetime.utcfromtimestamp(t_ms / 1000.0).replace(tzinfo=dt.timezone.utc).isoformat()
-
-        title = props.get("title") or f"M{props.get('mag', '?')} earthquake"
-        url = props.get("url") or ""
-        mag = props.get("mag")
-
-        event = {
-            "id": str(feat.get("id") or f"usgs_{i}"),
-            "title": title,
-            "description": f"Magnitude: {mag}" if mag is not None else "",
-            "link": url,
-            "categories": [{"id": "earthquakes", "title": "Earthquakes"}],
-            "geometry": [{
-                "type": "Point",
-                "coordinates": [lon, lat],
-                "date": date_iso or _iso_date(start) or _iso_date(end),
-            }],
-            "sources": [{"id": "USGS"}],
-            "closed": None,
-        }
-        events_out.append(event)
-
-        # учёт статистики
-        stats["in_region"] += 1
-        stats["by_category"]["earthquakes"] = stats["by_category"].get("earthquakes", 0) + 1
-
-        if len(stats["sample_coordinates"]) < 10:
-            stats["sample_coordinates"].append({
-                "title": title[:50],
-                "coords": [lon, lat],
-                "distance_deg": 0.0,  # не считаем для уже отсечённого bbox
-            })
+    # Оставляем только точки с координатами; дальше работаем с массивами
+    geoms = [(f.get("geometry") or {}).get("coordinates") or [] for f in features]
+    idx = [i for i, c in enumerate(geoms) if len(c) >= 2]
+    n = len(idx)
+
+    coords = np.fromiter(
+        (v for i in idx for v in geoms[i][:2]), dtype=np.float64, count=2 * n
+    ).reshape(-1, 2)
+
+    # время события от USGS (миллисекунды от эпохи) — конвертируем все разом
+    props_list = [features[i].get("properties") or {} for i in idx]
+    raw_times = [p.get("time") for p in props_list]
+    has_time = [isinstance(t, (int, float)) for t in raw_times]
+    times_ms = np.fromiter(
+        (t if ok else 0 for t, ok in zip(raw_times, has_time)), dtype=np.int64, count=n
+    )
+    # view — без копии: те же int64, трактуемые как datetime64[ms]. Формат как у
+    # datetime.isoformat() с UTC (и как у _iso_date): "+00:00", микросекунды
+    # только если они ненулевые
+    iso_ms = np.datetime_as_string(times_ms.view("datetime64[ms]"), unit="ms").tolist()
+    iso_times = [
+        d[:19] + "+00:00" if d.endswith(".000") else d + "000+00:00" for d in iso_ms
+    ]
+    fallback_date = _iso_date(start) or _iso_date(end)
+
+    # bbox уже применён на стороне USGS (min/max lat/lon в запросе) — повторно не фильтруем.
+    # События отдаём колонками (SoA): словари не строятся, JSON пишется из массивов
+    mags = [p.get("mag") for p in props_list]
+    events_out = EventColumns(
+        ids=[str(features[i].get("id") or f"usgs_{i}") for i in idx],
+        titles=[
+            p.get("title") or f"M{p.get('mag', '?')} earthquake" for p in props_list
+        ],
+        descriptions=[f"Magnitude: {m}" if m is not None else "" for m in mags],
+        links=[p.get("url") or "" for p in props_list],
+        lons=np.ascontiguousarray(coords[:, 0]),
+        lats=np.ascontiguousarray(coords[:, 1]),
+        dates=[d if ok else fallback_date for d, ok in zip(iso_times, has_time)],
+        category_id="earthquakes",
+        category_title="Earthquakes",
+        source="USGS",
+    )
+
+    # т.к. уже отфильтровано по bbox на стороне API, считаем все как in_region
+    stats = make_stats(
+        total=len(features),
+        in_region=n,
+        by_category={"earthquakes": n} if n else {},
+        samples=sample_coordinates(
+            zip(events_out.titles, *coords[:SAMPLE_LIMIT].T.tolist())
+        ),
+    )
 
     return {"events": events_out, "stats": stats}
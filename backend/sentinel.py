@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import requests
+import httpx
+import ijson
+import numpy as np
+import orjson
 
+from backend.http_client import get_http_client, is_stale_response, resilient_get
 from backend.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -20,24 +27,116 @@ __all__ = [
 ]
 
 
-def _get_token() -> str:
+class _TokenCache:
+    """
+    Кэш OAuth2 токена CDSE: переиспользуем токен до истечения expires_in
+    (с запасом в 30 секунд), вместо нового рукопожатия на каждый запрос.
+    """
+
+    SAFETY_MARGIN_S = 30.0
+
+    def __init__(self) -> None:
+        self.token: Optional[str] = None
+        self.expires_at: float = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        """
+        asyncio.Lock для текущего event loop. Создаётся лениво внутри loop:
+        до Python 3.10 Lock привязывается к loop при создании, а тесты и
+        asyncio.run поднимают новые loop'ы.
+        """
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def get(self) -> Optional[str]:
+        if self.token and time.monotonic() < self.expires_at - self.SAFETY_MARGIN_S:
+            return self.token
+        return None
+
+    def set(self, token: str, expires_in: float) -> None:
+        self.token = token
+        self.expires_at = time.monotonic() + expires_in
+
+    def clear(self) -> None:
+        self.token = None
+        self.expires_at = 0.0
+
+
+_token_cache = _TokenCache()
+
+
+class _SearchCache:
+    """
+    LRU-кэш ответов поиска CDSE: ключ — параметры запроса, значение —
+    (ETag, JSON, момент истечения). В пределах TTL отдаём JSON без запроса,
+    после — перепроверяем через If-None-Match (304 = без тела и без парсинга).
+    """
+
+    TTL_S = 60.0
+    MAX_ENTRIES = 128
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[Tuple, Tuple[Optional[str], Dict[str, Any], float]]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[Tuple[Optional[str], Dict[str, Any], bool]]:
+        """(etag, data, fresh) или None, если в кэше нет."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        etag, data, expires_at = entry
+        return etag, data, time.monotonic() < expires_at
+
+    def set(self, key: Tuple, etag: Optional[str], data: Dict[str, Any]) -> None:
+        self._entries[key] = (etag, data, time.monotonic() + self.TTL_S)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_search_cache = _SearchCache()
+
+
+async def _get_token() -> str:
     """
     Получение OAuth2 access_token для CDSE (Copernicus Data Space Ecosystem).
+    Токен кэшируется до истечения срока действия.
     """
-    logger.debug("Requesting access_token from %s", settings.CDSE_TOKEN_URL)
-    resp = requests.post(
-        settings.CDSE_TOKEN_URL,
-        data={
-            "client_id": settings.CDSE_CLIENT_ID,
-            "client_secret": settings.CDSE_CLIENT_SECRET,
-            "grant_type": "client_credentials",
-        },
-        timeout=10,
-    )
-    resp.raise_for_status()
-    token = resp.json()["access_token"]
-    logger.debug("Token successfully obtained, length=%d", len(token))
-    return token
+    token = _token_cache.get()
+    if token:
+        return token
+
+    async with _token_cache.lock:
+        # Пока ждали блокировку, токен мог обновить другой запрос
+        token = _token_cache.get()
+        if token:
+            return token
+
+        logger.debug("Requesting access_token from %s", settings.CDSE_TOKEN_URL)
+        resp = await get_http_client().post(
+            settings.CDSE_TOKEN_URL,
+            data={
+                "client_id": settings.CDSE_CLIENT_ID,
+                "client_secret": settings.CDSE_CLIENT_SECRET,
+                "grant_type": "client_credentials",
+            },
+            timeout=10,
+        )
+        resp.raise_for_status()
+        payload = resp.json()
+        token = payload["access_token"]
+        _token_cache.set(token, float(payload.get("expires_in", 0)))
+        logger.debug("Token successfully obtained, length=%d", len(token))
+        return token
 
 
 def _iso_or_default(date_str: Optional[str], default_delta_days: int) -> str:
@@ -52,7 +151,17 @@ def _iso_or_default(date_str: Optional[str], default_delta_days: int) -> str:
     return (datetime.now(timezone.utc) - timedelta(days=default_delta_days)).isoformat() + "Z"
 
 
-def search_products(
+def _ring_to_wkt(ring: List[List[float]]) -> str:
+    """
+    Кольцо GeoJSON [[lon, lat], ...] -> "lon lat,lon lat,..." одним векторным
+    проходом NumPy вместо f-строки на каждую вершину.
+    """
+    arr = np.asarray(ring, dtype=np.float64)[:, :2]
+    pairs = np.char.add(np.char.add(arr[:, 0].astype(str), " "), arr[:, 1].astype(str))
+    return ",".join(pairs.tolist())
+
+
+async def search_products(
     bbox: List[float],
     start: Optional[str],
     end: Optional[str],
@@ -70,149 +179,20 @@ def search_products(
         "CDSE search: bbox=%s start=%s end=%s platform=%s cloudmax=%s limit=%s",
         bbox, start, end, platform, cloudmax, limit,
     )
+    cache_key = (tuple(bbox), start, end, platform, cloudmax, limit)
+    cached = _search_cache.get(cache_key)
     try:
-        token = _get_token()
-        headers = {"Authorization": f"Bearer {token}"}
-
-        # Геометрия запроса (BBOX) в WKT
-        lonmin, latmin, lonmax, latmax = bbox
-        area_wkt = (
-            f"POLYGON(({lonmin} {latmin},{lonmax} {latmin},"
-            f"{lonmax} {latmax},{lonmin} {latmax},{lonmin} {latmin}))"
-        )
-        logger.debug("WKT area: %s", area_wkt)
-
-        date_start = _iso_or_default(start, default_delta_days=30)
-        date_end   = _iso_or_default(end,   default_delta_days=0)
-        logger.debug("Search period: %s - %s", date_start, date_end)
-
-        # Фильтры OData
-        filters: List[str] = []
-
-        # Коллекция
-        if platform == "Sentinel-2":
-            filters.append("Collection/Name eq 'SENTINEL-2'")
-        elif platform == "Sentinel-1":
-            filters.append("Collection/Name eq 'SENTINEL-1'")
-
-        # Временной интервал
-        filters.append(f"ContentDate/Start ge {date_start}")
-        filters.append(f"ContentDate/Start le {date_end}")
-
-        # Пересечение с областью (WKT)
-        filters.append(f"OData.CSC.Intersects(area=geography'SRID=4326;{area_wkt}')")
-
-        # Облачность (только для S2)
-        if platform == "Sentinel-2" and cloudmax < 100:
-            filters.append(
-                "Attributes/OData.CSC.DoubleAttribute/any(att:"
-                "att/Name eq 'cloudCover' and "
-                f"att/OData.CSC.DoubleAttribute/Value le {float(cloudmax)})"
-            )
-
-        filter_string = " and ".join(filters)
-
-        url = f"{settings.CDSE_API_URL}/Products"
-        params = {
-            "$filter": filter_string,
-            "$orderby": "ContentDate/Start desc",
-            "$top": str(int(limit)),
-            "$expand": "Attributes",
-            "$select": "Id,Name,ContentDate,ContentLength,S3Path,Checksum,GeoFootprint",
-        }
-
-        logger.debug("CDSE GET %s params=%s", url, params)
-        resp = requests.get(url, params=params, headers=headers, timeout=30)
-
-        if resp.status_code != 200:
-            logger.error("CDSE API error: %s - %s", resp.status_code, resp.text)
-            resp.raise_for_status()
-
-        data = resp.json()
-
-        # === ДИАГНОСТИКА: проверка структуры ответа ===
-        if data.get("value"):
-            sample = data["value"][0]
-            logger.info("=== CDSE RESPONSE DIAGNOSTIC ===")
-            logger.info("Available keys: %s", list(sample.keys()))
-            logger.info("GeoFootprint type: %s, value: %s", 
-                        type(sample.get("GeoFootprint")), 
-                        str(sample.get("GeoFootprint"))[:200])
-            logger.info("Footprint: %s", sample.get("Footprint"))
-            logger.info("================================")
-
-        items: List[Dict[str, Any]] = []
-
-        items: List[Dict[str, Any]] = []
-        for entry in data.get("value", []):
-            # Облачность
-            cloud_cover: Optional[float] = None
-            for attr in entry.get("Attributes", []):
-                if attr.get("Name") == "cloudCover":
-                    cloud_cover = attr.get("Value")
-                    break
-
-            # ---- Геометрия: WKT или GeoJSON -> WKT ----
-            footprint_wkt: Optional[str] = None
-
-            # CDSE иногда отдаёт сразу WKT-строку
-            geofoot = (
-                entry.get("GeoFootprint")
-                or entry.get("Footprint")
-                or entry.get("footprint")
-            )
-
-            if isinstance(geofoot, str):
-                # Уже WKT
-                footprint_wkt = geofoot.strip()
-
-            elif isinstance(geofoot, dict):
-                # GeoJSON -> WKT (Polygon/MultiPolygon)
-                gtype = geofoot.get("type")
-                coords = geofoot.get("coordinates") or []
-
-                if gtype == "Polygon":
-                    # coords: [ [ [lon,lat], ... ] ]
-                    ring = coords[0] if coords else []
-                    if ring:
-                        wkt_coords = " ".join(f"{lon} {lat}" for lon, lat in ring)
-                        footprint_wkt = f"POLYGON(({wkt_coords}))"
-
-                elif gtype == "MultiPolygon":
-                    # coords: [ [ [ [lon,lat], ... ] ], [ ... ] ]
-                    polys: List[str] = []
-                    for polygon in coords:
-                        if polygon and polygon[0]:
-                            wkt_coords = " ".join(f"{lon} {lat}" for lon, lat in polygon[0])
-                            polys.append(f"(({wkt_coords}))")
-                    if polys:
-                        footprint_wkt = f"MULTIPOLYGON({','.join(polys)})"
-
-            product_id = entry.get("Id")
-            item = {
-                "product_id": product_id,
-                "title": entry.get("Name", "Unknown"),
-                "beginposition": entry.get("ContentDate", {}).get("Start"),
-                "endposition": entry.get("ContentDate", {}).get("End"),
-                "cloudcover": cloud_cover,
-                "footprint_wkt": footprint_wkt,
-                "quicklook_url": f"/api/v1/sentinel/quicklook/{product_id}" if product_id else None,
-                "size": entry.get("ContentLength"),
-                "platform": platform,
-                "s3_path": entry.get("S3Path"),
-            }
-            items.append(item)
-
-        logger.info(
-            "CDSE: найдено %d продуктов (reported count=%s)",
-            len(items), data.get("@odata.count", len(items))
-        )
-        return items
+        if cached is not None and cached[2]:
+            logger.debug("CDSE search: cache hit")
+            data = cached[1]
+        else:
+            data = await _fetch_search(bbox, start, end, platform, cloudmax, limit, cache_key, cached)
+        return _parse_search(data, platform)
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("Timeout while requesting CDSE API")
         raise Exception("CDSE API timeout")
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error("Network error while requesting CDSE: %s", str(e))
         raise Exception(f"Network error: {str(e)}")
     except Exception as e:
@@ -220,7 +200,180 @@ def search_products(
         raise Exception(f"Search failed: {str(e)}")
 
 
-def get_quicklook(product_id: str) -> bytes:
+async def _fetch_search(
+    bbox: List[float],
+    start: Optional[str],
+    end: Optional[str],
+    platform: str,
+    cloudmax: int,
+    limit: int,
+    cache_key: Tuple,
+    cached: Optional[Tuple[Optional[str], Dict[str, Any], bool]],
+) -> Dict[str, Any]:
+    """
+    Запрос к CDSE OData /Products. Если есть устаревшая запись кэша с ETag —
+    отправляем If-None-Match и на 304 возвращаем закэшированный JSON.
+    """
+    token = await _get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    if cached is not None and cached[0]:
+        headers["If-None-Match"] = cached[0]
+
+    # Геометрия запроса (BBOX) в WKT
+    lonmin, latmin, lonmax, latmax = bbox
+    area_wkt = (
+        f"POLYGON(({lonmin} {latmin},{lonmax} {latmin},"
+        f"{lonmax} {latmax},{lonmin} {latmax},{lonmin} {latmin}))"
+    )
+    logger.debug("WKT area: %s", area_wkt)
+
+    date_start = _iso_or_default(start, default_delta_days=30)
+    date_end   = _iso_or_default(end,   default_delta_days=0)
+    logger.debug("Search period: %s - %s", date_start, date_end)
+
+    # Фильтры OData
+    filters: List[str] = []
+
+    # Коллекция
+    if platform == "Sentinel-2":
+        filters.append("Collection/Name eq 'SENTINEL-2'")
+    elif platform == "Sentinel-1":
+        filters.append("Collection/Name eq 'SENTINEL-1'")
+
+    # Временной интервал
+    filters.append(f"ContentDate/Start ge {date_start}")
+    filters.append(f"ContentDate/Start le {date_end}")
+
+    # Пересечение с областью (WKT)
+    filters.append(f"OData.CSC.Intersects(area=geography'SRID=4326;{area_wkt}')")
+
+    # Облачность (только для S2)
+    if platform == "Sentinel-2" and cloudmax < 100:
+        filters.append(
+            "Attributes/OData.CSC.DoubleAttribute/any(att:"
+            "att/Name eq 'cloudCover' and "
+            f"att/OData.CSC.DoubleAttribute/Value le {float(cloudmax)})"
+        )
+
+    filter_string = " and ".join(filters)
+
+    url = f"{settings.CDSE_API_URL}/Products"
+    params = {
+        "$filter": filter_string,
+        "$orderby": "ContentDate/Start desc",
+        "$top": str(int(limit)),
+        "$expand": "Attributes",
+        "$select": "Id,Name,ContentDate,ContentLength,S3Path,Checksum,GeoFootprint",
+    }
+
+    logger.debug("CDSE GET %s params=%s", url, params)
+    resp = await resilient_get(url, params=params, headers=headers, timeout=30)
+    if resp.status_code == 304 and cached is not None:
+        logger.debug("CDSE search: 304 Not Modified, using cached response")
+        _search_cache.set(cache_key, cached[0], cached[1])
+        return cached[1]
+
+    if resp.status_code != 200:
+        logger.error("CDSE API error: %s - %s", resp.status_code, resp.text)
+        if resp.status_code == 401:
+            # Токен отозван раньше срока — следующий запрос получит новый
+            _token_cache.clear()
+        resp.raise_for_status()
+
+    # Разбираем "value" итеративно: продукты собираются по одному,
+    # без построения полного дерева всего ответа
+    products: List[Dict[str, Any]] = []
+    for product in ijson.items(resp.content, "value.item", use_float=True):
+        products.append(product)
+        if len(products) >= limit:
+            break
+
+    data = {"value": products}
+    if not is_stale_response(resp):
+        _search_cache.set(cache_key, resp.headers.get("ETag"), data)
+    return data
+
+
+def _parse_search(data: Dict[str, Any], platform: str) -> List[Dict[str, Any]]:
+    """Ответ CDSE OData -> список продуктов в нашем формате."""
+    # === ДИАГНОСТИКА: проверка структуры ответа ===
+    if data.get("value"):
+        sample = data["value"][0]
+        logger.info("=== CDSE RESPONSE DIAGNOSTIC ===")
+        logger.info("Available keys: %s", list(sample.keys()))
+        logger.info("GeoFootprint type: %s, value: %s", 
+                    type(sample.get("GeoFootprint")), 
+                    str(sample.get("GeoFootprint"))[:200])
+        logger.info("Footprint: %s", sample.get("Footprint"))
+        logger.info("================================")
+
+    entries = data.get("value", [])
+    items: List[Any] = [None] * len(entries)
+    for i, entry in enumerate(entries):
+        # Облачность
+        cloud_cover: Optional[float] = None
+        for attr in entry.get("Attributes", []):
+            if attr.get("Name") == "cloudCover":
+                cloud_cover = attr.get("Value")
+                break
+
+        # ---- Геометрия: WKT или GeoJSON -> WKT ----
+        footprint_wkt: Optional[str] = None
+
+        # CDSE иногда отдаёт сразу WKT-строку
+        geofoot = (
+            entry.get("GeoFootprint")
+            or entry.get("Footprint")
+            or entry.get("footprint")
+        )
+
+        if isinstance(geofoot, str):
+            # Уже WKT
+            footprint_wkt = geofoot.strip()
+
+        elif isinstance(geofoot, dict):
+            # GeoJSON -> WKT (Polygon/MultiPolygon)
+            gtype = geofoot.get("type")
+            coords = geofoot.get("coordinates") or []
+
+            if gtype == "Polygon":
+                # coords: [ [ [lon,lat], ... ] ]
+                ring = coords[0] if coords else []
+                if ring:
+                    footprint_wkt = f"POLYGON(({_ring_to_wkt(ring)}))"
+
+            elif gtype == "MultiPolygon":
+                # coords: [ [ [ [lon,lat], ... ] ], [ ... ] ]
+                polys: List[str] = []
+                for polygon in coords:
+                    if polygon and polygon[0]:
+                        polys.append(f"(({_ring_to_wkt(polygon[0])}))")
+                if polys:
+                    footprint_wkt = f"MULTIPOLYGON({','.join(polys)})"
+
+        product_id = entry.get("Id")
+        item = {
+            "product_id": product_id,
+            "title": entry.get("Name", "Unknown"),
+            "beginposition": entry.get("ContentDate", {}).get("Start"),
+            "endposition": entry.get("ContentDate", {}).get("End"),
+            "cloudcover": cloud_cover,
+            "footprint_wkt": footprint_wkt,
+            "quicklook_url": f"/api/v1/sentinel/quicklook/{product_id}" if product_id else None,
+            "size": entry.get("ContentLength"),
+            "platform": platform,
+            "s3_path": entry.get("S3Path"),
+        }
+        items[i] = item
+
+    logger.info(
+        "CDSE: найдено %d продуктов (reported count=%s)",
+        len(items), data.get("@odata.count", len(items))
+    )
+    return items
+
+
+async def get_quicklook(product_id: str) -> bytes:
     """
     Получить quicklook/thumbnail по product_id из CDSE.
     Возвращает байты изображения (JPEG/PNG).
@@ -230,17 +383,44 @@ def get_quicklook(product_id: str) -> bytes:
         raise ValueError("product_id is required")
 
     try:
-        token = _get_token()
+        token = await _get_token()
         headers = {"Authorization": f"Bearer {token}"}
 
-        # CDSE: сначала Thumbnail, затем Quicklook (fallback)
+        # CDSE: Thumbnail и Quicklook запрашиваем параллельно (по HTTP/2 — в одном
+        # соединении). Thumbnail в приоритете: Quicklook берём, только если
+        # Thumbnail не удался; ненужный запрос отменяем
         url_thumb = f"{settings.CDSE_API_URL}/Products({product_id})/Thumbnail"
-        resp = requests.get(url_thumb, headers=headers, timeout=20)
+        url_quick = f"{settings.CDSE_API_URL}/Products({product_id})/Quicklook"
+        t_thumb = asyncio.create_task(resilient_get(url_thumb, headers=headers, timeout=20))
+        t_quick = asyncio.create_task(resilient_get(url_quick, headers=headers, timeout=20))
 
-        if resp.status_code == 404:
-            logger.warning("Thumbnail not found for %s, trying Quicklook", product_id)
-            url_quick = f"{settings.CDSE_API_URL}/Products({product_id})/Quicklook"
-            resp = requests.get(url_quick, headers=headers, timeout=20)
+        def _ok(task: asyncio.Task) -> bool:
+            return task.exception() is None and task.result().status_code == 200
+
+        resp: Optional[httpx.Response] = None
+        try:
+            await asyncio.wait({t_thumb})
+            if _ok(t_thumb):
+                resp = t_thumb.result()
+            else:
+                await asyncio.wait({t_quick})
+                if _ok(t_quick):
+                    resp = t_quick.result()
+        finally:
+            for task in (t_thumb, t_quick):
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # иначе asyncio: "Task exception was never retrieved"
+
+        if resp is None:
+            # Успешного ответа нет: ошибку берём у Thumbnail, если он не 404, иначе у Quicklook
+            if t_thumb.exception() is None and t_thumb.result().status_code != 404:
+                resp = t_thumb.result()
+            elif t_quick.exception() is not None:
+                raise t_quick.exception()
+            else:
+                resp = t_quick.result()
 
         if resp.status_code == 404:
             logger.error("Quicklook unavailable for product %s", product_id)
@@ -256,10 +436,10 @@ def get_quicklook(product_id: str) -> bytes:
         logger.debug("Quicklook OK: %d байт, %s", len(resp.content), ctype)
         return resp.content
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("Таймаут quicklook для %s", product_id)
         raise Exception("Quicklook timeout")
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error("Сетевая ошибка quicklook: %s", str(e))
         raise Exception(f"Network error: {str(e)}")
     except Exception:
@@ -267,21 +447,21 @@ def get_quicklook(product_id: str) -> bytes:
         raise
 
 
-def get_product_info(product_id: str) -> Dict[str, Any]:
+async def get_product_info(product_id: str) -> Dict[str, Any]:
     """
     Подтянуть детальную информацию по продукту, включая атрибуты.
     """
     logger.info("Product info: %s", product_id)
     try:
-        token = _get_token()
+        token = await _get_token()
         headers = {"Authorization": f"Bearer {token}"}
 
         url = f"{settings.CDSE_API_URL}/Products({product_id})"
         params = {"$expand": "Attributes"}  # Коллекцию не расширяем
-        resp = requests.get(url, params=params, headers=headers, timeout=15)
+        resp = await resilient_get(url, params=params, headers=headers, timeout=15)
         resp.raise_for_status()
 
-        data = resp.json()
+        data = orjson.loads(resp.content)
         info: Dict[str, Any] = {
             "id": data.get("Id"),
             "name": data.get("Name"),
@@ -305,16 +485,16 @@ def get_product_info(product_id: str) -> Dict[str, Any]:
         raise Exception(f"Failed to get product info: {str(e)}")
 
 
-def check_cdse_health() -> bool:
+async def check_cdse_health() -> bool:
     """
     Простой healthcheck CDSE API: возвращает True если отвечает /Collections.
     """
     try:
-        token = _get_token()
+        token = await _get_token()
         headers = {"Authorization": f"Bearer {token}"}
         url = f"{settings.CDSE_API_URL}/Collections"
         params = {"$top": "1"}
-        resp = requests.get(url, params=params, headers=headers, timeout=5)
+        resp = await get_http_client().get(url, params=params, headers=headers, timeout=5)
         ok = resp.status_code == 200
         if ok:
             logger.info("CDSE API доступен")
@@ -1,8 +1,10 @@
 # ===============================================
 # backend/settings.py
 # ===============================================
+from functools import cached_property, lru_cache
 from pathlib import Path
 import logging
+import os
 from typing import Tuple, Optional, Literal
 from pydantic import Field, AliasChoices, HttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -148,19 +150,47 @@ class Settings(BaseSettings):
     CACHE_WARNING_THRESHOLD_PCT: float = 80.0  # Warning threshold percentage
     CACHE_CRITICAL_THRESHOLD_PCT: float = 95.0  # Critical threshold percentage
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS_ORIGINS into a list"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
 
-    @property
+    @cached_property
     def overpass_endpoints_list(self) -> list[str]:
         """Parse OVERPASS_ENDPOINTS into a list"""
         return [endpoint.strip() for endpoint in self.OVERPASS_ENDPOINTS.split(",") if endpoint.strip()]
 
 
 # ================== Инициализация ==================
-settings = Settings()
+def _env_keys() -> Tuple[str, ...]:
+    """Имена переменных окружения, которые читает Settings (поля и их алиасы)."""
+    keys = set()
+    for name, field in Settings.model_fields.items():
+        keys.add(name)
+        alias = field.validation_alias
+        if isinstance(alias, AliasChoices):
+            keys.update(c for c in alias.choices if isinstance(c, str))
+    return tuple(sorted(keys))
+
+
+_ENV_KEYS = _env_keys()
+
+
+@lru_cache(maxsize=4)
+def _settings_for_env(env: Tuple[Tuple[str, Optional[str]], ...]) -> Settings:
+    return Settings()
+
+
+def get_settings() -> Settings:
+    """
+    Настройки процесса: .env разбирается и валидируется один раз. Ключ кэша —
+    значения относящихся к Settings переменных окружения, так что процесс
+    (например, форк воркера) с изменённым окружением получит свежие настройки.
+    """
+    return _settings_for_env(tuple((k, os.environ.get(k)) for k in _ENV_KEYS))
+
+
+settings = get_settings()
 
 # Гарантируем существование директорий
 settings.DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -2,10 +2,13 @@
 from __future__ import annotations
 
 import logging
+import threading
 from pathlib import Path
 from time import sleep
+from typing import Any, Optional
 
 from celery import Celery
+from celery.signals import worker_init
 
 
 
@@ -13,13 +16,70 @@ from backend.settings import settings
 
 logger = logging.getLogger(__name__)
 
-# Celery app
+# Celery app: ограниченный пул соединений с брокером вместо нового TCP на каждую публикацию
 celery_app = Celery(
     "akmola",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_BACKEND_URL,
+    broker_pool_limit=10,
+    broker_connection_retry_on_startup=True,
+    broker_transport_options={
+        "max_connections": 20,
+        "socket_keepalive": True,
+        "health_check_interval": 60,
+        "retry_on_timeout": True,
+    },
+    redis_max_connections=20,
+    # COG-конвертация долгая: не резервировать задачи впрок и подтверждать
+    # только после выполнения, чтобы упавший воркер не терял задачу
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
 )
 
+# Тяжёлые модули, которые нужны задачам конвертации
+PRELOAD_MODULES = ("numpy", "rasterio", "osgeo.gdal")
+
+
+@worker_init.connect
+def _preload_heavy_modules(**_: Any) -> None:
+    """
+    Импортировать rasterio/GDAL в главном процессе воркера до форка пула:
+    дочерние процессы prefork получают уже загруженные модули (copy-on-write)
+    и не тратят секунды на импорт при старте.
+    """
+    import importlib
+
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            logger.debug("Preload skipped, module not installed: %s", name)
+
+# Общий клиент Redis брокера для прямых обращений (healthcheck и т.п.)
+_broker_client: Optional[Any] = None
+_broker_client_lock = threading.Lock()
+
+
+def get_broker_client():
+    """
+    Вернуть процессный redis.Redis для CELERY_BROKER_URL (создаётся лениво).
+    ImportError пробрасывается, если библиотека redis не установлена.
+    """
+    global _broker_client
+    if _broker_client is None:
+        with _broker_client_lock:
+            if _broker_client is None:
+                from redis import Redis
+                _broker_client = Redis.from_url(
+                    settings.CELERY_BROKER_URL,
+                    health_check_interval=60,
+                    socket_keepalive=True,
+                    socket_connect_timeout=2,
+                    socket_timeout=5,
+                    max_connections=20,
+                )
+    return _broker_client
+
 @celery_app.task(name="download_and_cog")
 def download_and_cog(product_id: str) -> dict:
     """
@@ -0,0 +1,52 @@
+"""Тесты квадродерева AOIIndex"""
+
+import random
+
+from backend.geo.index import AOIIndex
+
+
+def _node_count(node):
+    count = 1
+    for child in node.children or ():
+        count += _node_count(child)
+    return count
+
+
+def _stored_items(node):
+    total = len(node.items)
+    for child in node.children or ():
+        total += _stored_items(child)
+    return total
+
+
+def test_overlapping_aois_over_capacity():
+    bbox = (68.0, 50.0, 75.0, 54.0)
+    index = AOIIndex(((f"aoi-{i}", bbox) for i in range(5)), capacity=4)
+
+    assert len(index) == 5
+    # Пересекающиеся AOI не копируются по квадрантам
+    assert _stored_items(index._root) == 5
+    assert _node_count(index._root) <= 1 + 4 * index.max_depth
+    assert sorted(index.match(71.4, 51.1)) == [f"aoi-{i}" for i in range(5)]
+    assert index.match(10.0, 10.0) == []
+
+
+def test_match_agrees_with_brute_force():
+    rng = random.Random(42)
+    aois = []
+    for i in range(300):
+        lon = rng.uniform(60.0, 80.0)
+        lat = rng.uniform(45.0, 55.0)
+        aois.append((f"aoi-{i}", (lon, lat, lon + rng.uniform(0.01, 5.0), lat + rng.uniform(0.01, 3.0))))
+    index = AOIIndex(aois, capacity=4)
+
+    assert _stored_items(index._root) == len(aois)
+    for _ in range(500):
+        lon = rng.uniform(59.0, 86.0)
+        lat = rng.uniform(44.0, 59.0)
+        expected = sorted(
+            aoi_id
+            for aoi_id, (x1, y1, x2, y2) in aois
+            if x1 <= lon <= x2 and y1 <= lat <= y2
+        )
+        assert sorted(index.match(lon, lat)) == expected
@@ -0,0 +1,43 @@
+"""Тесты статистик растров (backend.utils.stats)"""
+
+import numpy as np
+import pytest
+
+from backend.utils.stats import (
+    compute_basic_stats,
+    compute_comprehensive_stats,
+    compute_percentiles,
+)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int16])
+def test_masked_array_mask_is_honoured(dtype):
+    rng = np.random.default_rng(0)
+    raw = rng.uniform(0, 100, size=(64, 64)).astype(dtype)
+    mask = rng.random((64, 64)) < 0.3
+    if np.issubdtype(dtype, np.floating):
+        raw[mask] = np.nan  # nodata под маской не должен попасть в статистику
+    else:
+        raw[mask] = -9999
+    data = np.ma.MaskedArray(raw, mask=mask)
+    expected = raw[~mask].astype(np.float64)
+
+    basic = compute_basic_stats(data)
+    assert basic["median"] == pytest.approx(np.median(expected))
+    assert basic["mean"] == pytest.approx(expected.mean(), rel=1e-5)
+    assert basic["std"] == pytest.approx(expected.std(), rel=1e-4)
+    assert basic["min"] == pytest.approx(expected.min())
+    assert basic["max"] == pytest.approx(expected.max())
+
+    pcts = compute_percentiles(data, [10, 90])
+    assert pcts["p10"] == pytest.approx(np.percentile(expected, 10))
+    assert pcts["p90"] == pytest.approx(np.percentile(expected, 90))
+
+    full = compute_comprehensive_stats(data)
+    assert full["median"] == pytest.approx(np.median(expected))
+    assert full["pixels"] == expected.size
+
+
+def test_fully_masked_array_has_no_stats():
+    data = np.ma.MaskedArray(np.ones(10), mask=np.ones(10, dtype=bool))
+    assert compute_basic_stats(data)["mean"] is None
@@ -1,41 +1,60 @@
 """Shared utility modules for the Akmola Sentinel API"""
 
-from backend.utils.geo import choose_optimal_resolution
+from backend.utils.geo import choose_optimal_resolution, choose_optimal_resolution_batch
 from backend.utils.stats import compute_basic_stats
 from backend.utils.validation import (
     validate_bbox,
+    validate_bboxes,
     validate_dates,
     validate_bins,
     validate_image_dimensions,
     validate_coordinates,
 )
 from backend.utils.cache import (
+    LOCK_NAME,
     file_lock,
+    cache_lock_path,
     atomic_write_cache,
+    atomic_write_cache_stream,
     safe_cache_read,
+    send_cache_file,
     cleanup_old_cache,
     get_cache_stats,
+    reconcile_cache_stats,
+    record_cache_write,
+    remove_cache_file,
     is_cache_valid,
     get_cache_age_seconds,
     touch_cache_file,
+    open_valid_cache,
     cleanup_expired_cache,
 )
 
 __all__ = [
     "choose_optimal_resolution",
+    "choose_optimal_resolution_batch",
     "compute_basic_stats",
     "validate_bbox",
+    "validate_bboxes",
     "validate_dates",
     "validate_bins",
     "validate_image_dimensions",
     "validate_coordinates",
+    "LOCK_NAME",
     "file_lock",
+    "cache_lock_path",
     "atomic_write_cache",
+    "atomic_write_cache_stream",
     "safe_cache_read",
+    "send_cache_file",
     "cleanup_old_cache",
     "get_cache_stats",
+    "reconcile_cache_stats",
+    "record_cache_write",
+    "remove_cache_file",
     "is_cache_valid",
     "get_cache_age_seconds",
     "touch_cache_file",
+    "open_valid_cache",
     "cleanup_expired_cache",
 ]
@@ -2,19 +2,53 @@
 Cache management utilities for cleaning up old files and safe file operations
 """
 
+import errno
 import fcntl
+import fnmatch
+import heapq
 import logging
+import math
 import os
+import shutil
 import tempfile
+import threading
+import time
+from operator import itemgetter
 from pathlib import Path
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Callable, TypeVar, Any
+from stat import S_ISREG
+from datetime import datetime, timezone
+from typing import Optional, Callable, TypeVar, Any, BinaryIO, Iterable, Iterator, Tuple, Union
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# One long-lived lock file per cache directory (see cache_lock_path)
+LOCK_NAME = ".lock"
+
+
+def _walk(directory: Union[Path, str]) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield regular files under directory via os.scandir.
+
+    DirEntry caches the type check and stat() result, so each file costs at
+    most one stat syscall (none for the type check on most filesystems).
+    Symlinks are not followed.
+    """
+    stack = [os.fspath(directory)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except OSError as e:
+            logger.warning(f"Cannot scan {current}: {e}")
+
 
 def cleanup_old_cache(
     cache_dir: Path,
@@ -38,57 +72,72 @@ def cleanup_old_cache(
         logger.warning(f"Cache directory does not exist: {cache_dir}")
         return {"deleted": 0, "freed_mb": 0}
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    cutoff_ts = time.time() - max_age_days * 86400
     deleted_count = 0
     freed_bytes = 0
 
-    # Collect all files with their metadata
-    files = []
-    for file_path in cache_dir.rglob("*"):
-        if file_path.is_file():
-            stat = file_path.stat()
-            files.append({
-                "path": file_path,
-                "mtime": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
-                "size": stat.st_size
-            })
-
-    # Sort by modification time (oldest first)
-    files.sort(key=lambda x: x["mtime"])
-
-    # Delete old files
-    for file_info in files:
-        if file_info["mtime"] < cutoff:
-            try:
-                if not dry_run:
-                    file_info["path"].unlink()
-                deleted_count += 1
-                freed_bytes += file_info["size"]
-                logger.debug(f"Deleted old file: {file_info['path']}")
-            except Exception as e:
-                logger.error(f"Failed to delete {file_info['path']}: {e}")
-
-    # If max_size specified, delete oldest files until under limit
-    if max_size_mb is not None:
+    # One walk, one stat per file; age-expired files are deleted on the spot
+    # (linear pass, no sort needed), the rest are kept for the size cap
+    kept = []
+    removed = []  # for Redis stats
+    total_size = 0
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for entry in _walk(cache_dir):
+        if entry.name == LOCK_NAME:
+            continue  # long-lived directory lock, see cache_lock_path
+        try:
+            stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        file_info = (stat.st_mtime, stat.st_size, entry.path)
+        if file_info[0] >= cutoff_ts:
+            kept.append(file_info)
+            total_size += file_info[1]
+            continue
+        try:
+            if not dry_run:
+                os.unlink(file_info[2])
+                removed.append((os.path.abspath(file_info[2]), -1, -file_info[1], None))
+            deleted_count += 1
+            freed_bytes += file_info[1]
+            if debug:
+                logger.debug("Deleted old file: %s", file_info[2])
+        except Exception as e:
+            kept.append(file_info)
+            total_size += file_info[1]
+            logger.error(f"Failed to delete {file_info[2]}: {e}")
+
+    # If max_size specified, delete oldest files until under limit. Only the
+    # oldest k files are selected (heapq.nsmallest), k is estimated from the
+    # average file size and doubled if that was not enough.
+    if max_size_mb is not None and kept:
         max_bytes = max_size_mb * 1024 * 1024
-        total_size = sum(f["size"] for f in files if f["path"].exists())
-
-        for file_info in files:
-            if total_size <= max_bytes:
-                break
-            if not file_info["path"].exists():
-                continue  # Already deleted
-
-            try:
-                if not dry_run:
-                    file_info["path"].unlink()
-                deleted_count += 1
-                freed_bytes += file_info["size"]
-                total_size -= file_info["size"]
-                logger.debug(f"Deleted for size limit: {file_info['path']}")
-            except Exception as e:
-                logger.error(f"Failed to delete {file_info['path']}: {e}")
-
+        excess = total_size - max_bytes
+        avg_size = max(total_size / len(kept), 1)
+        k = max(1, math.ceil(excess / avg_size))
+        done = 0
+
+        while total_size > max_bytes and done < len(kept):
+            k = min(k, len(kept))
+            oldest = heapq.nsmallest(k, kept, key=itemgetter(0))
+            for mtime, size, path in oldest[done:]:
+                if total_size <= max_bytes:
+                    break
+                done += 1
+                try:
+                    if not dry_run:
+                        os.unlink(path)
+                        removed.append((os.path.abspath(path), -1, -size, None))
+                    deleted_count += 1
+                    freed_bytes += size
+                    total_size -= size
+                    if debug:
+                        logger.debug("Deleted for size limit: %s", path)
+                except Exception as e:
+                    logger.error(f"Failed to delete {path}: {e}")
+            k *= 2
+
+    _stats_update(removed)
     freed_mb = freed_bytes / (1024 * 1024)
     logger.info(
         f"Cache cleanup {'(dry run)' if dry_run else ''}: "
@@ -101,10 +150,207 @@ def cleanup_old_cache(
     }
 
 
+# Redis-backed cache stats: writes/deletions keep a per-root hash
+# (files, size_bytes, scanned_at) and a path -> mtime sorted set up to date,
+# so get_cache_stats does not have to walk the tree on every call.
+STATS_KEY_PREFIX = "cache:stats:"
+STATS_ROOTS_KEY = "cache:stats:roots"
+STATS_RESCAN_SECONDS = 3600  # full rescan to reconcile drift
+STATS_RETRY_SECONDS = 60.0  # back-off after a Redis error
+STATS_ROOTS_TTL = 60.0  # how long the local copy of tracked roots is reused
+STATS_ZADD_BATCH = 10000
+STATS_SOCKET_TIMEOUT = 1.0  # seconds; stats are best-effort, never stall a write
+
+_stats_disabled_until = 0.0
+_stats_roots: Tuple[str, ...] = ()
+_stats_roots_loaded_at = -math.inf
+_stats_redis: Optional[Any] = None
+_stats_redis_lock = threading.Lock()
+
+
+def _stats_disable(error: Exception) -> None:
+    """Stop talking to Redis for STATS_RETRY_SECONDS after an error."""
+    global _stats_disabled_until
+    _stats_disabled_until = time.monotonic() + STATS_RETRY_SECONDS
+    logger.debug("Redis cache stats unavailable: %s", error)
+
+
+def _stats_client() -> Optional[Any]:
+    """
+    Process-wide Redis client for CELERY_BROKER_URL (created lazily), or
+    None if Redis is not usable right now (not installed or erroring).
+    """
+    global _stats_redis
+    if time.monotonic() < _stats_disabled_until:
+        return None
+    if _stats_redis is None:
+        with _stats_redis_lock:
+            if _stats_redis is None:
+                try:
+                    from redis import Redis
+                    from backend.settings import settings
+                    _stats_redis = Redis.from_url(
+                        settings.CELERY_BROKER_URL,
+                        health_check_interval=60,
+                        socket_keepalive=True,
+                        socket_connect_timeout=STATS_SOCKET_TIMEOUT,
+                        socket_timeout=STATS_SOCKET_TIMEOUT,
+                    )
+                except Exception as e:
+                    _stats_disable(e)
+                    return None
+    return _stats_redis
+
+
+def _stats_roots_for(path: str) -> Tuple[str, ...]:
+    """
+    Tracked cache roots containing path (empty if stats are not tracked).
+
+    Args:
+        path: Absolute file path
+
+    Returns:
+        Tuple of root directories (absolute paths)
+    """
+    global _stats_roots, _stats_roots_loaded_at
+    client = _stats_client()
+    if client is None:
+        return ()
+
+    now = time.monotonic()
+    if now - _stats_roots_loaded_at > STATS_ROOTS_TTL:
+        try:
+            _stats_roots = tuple(
+                r.decode() if isinstance(r, bytes) else r
+                for r in client.smembers(STATS_ROOTS_KEY)
+            )
+        except Exception as e:
+            _stats_disable(e)
+            return ()
+        _stats_roots_loaded_at = now
+
+    return tuple(root for root in _stats_roots if path.startswith(root + os.sep))
+
+
+def _stats_update(changes: Iterable[Tuple[str, int, int, Optional[float]]]) -> None:
+    """
+    Apply file changes to the Redis stats of every tracked root (one pipeline).
+
+    Args:
+        changes: (absolute path, files delta, size delta, new mtime or None if removed)
+    """
+    pipe = None
+    try:
+        for path, files_delta, size_delta, mtime in changes:
+            for root in _stats_roots_for(path):
+                if pipe is None:
+                    pipe = _stats_client().pipeline(transaction=False)
+                key = STATS_KEY_PREFIX + root
+                if files_delta:
+                    pipe.hincrby(key, "files", files_delta)
+                if size_delta:
+                    pipe.hincrby(key, "size_bytes", size_delta)
+                if mtime is None:
+                    pipe.zrem(key + ":mtimes", path)
+                else:
+                    pipe.zadd(key + ":mtimes", {path: mtime})
+        if pipe is not None:
+            pipe.execute()
+    except Exception as e:
+        _stats_disable(e)
+
+
+def _stats_record_write(cache_path: Path, size: int, old_size: Optional[int]) -> None:
+    """Account a finished cache write (old_size is None for a new file)."""
+    path = os.path.abspath(cache_path)
+    _stats_update([(path, 1 if old_size is None else 0, size - (old_size or 0), time.time())])
+
+
+def _existing_size(cache_path: Path) -> Optional[int]:
+    """Size of the file about to be replaced (None if there is none)."""
+    try:
+        return os.stat(cache_path).st_size
+    except OSError:
+        return None
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() if ts is not None else None
+
+
+def reconcile_cache_stats(cache_dir: Path) -> dict:
+    """
+    Walk cache directory and store fresh statistics in Redis.
+
+    Called by get_cache_stats when Redis has no stats for the directory or
+    they are older than STATS_RESCAN_SECONDS. Works without Redis too, then
+    it is just a filesystem scan.
+
+    Args:
+        cache_dir: Directory to analyze
+
+    Returns:
+        Dictionary with cache statistics
+    """
+    # Single pass: count, size and mtime range from one stat per file
+    file_count = 0
+    total_size = 0
+    min_mtime: Optional[float] = None
+    max_mtime: Optional[float] = None
+    client = _stats_client()
+    mtimes = {} if client is not None else None
+    for entry in _walk(cache_dir):
+        if entry.name == LOCK_NAME:
+            continue
+        try:
+            stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        file_count += 1
+        total_size += stat.st_size
+        mtime = stat.st_mtime
+        if min_mtime is None or mtime < min_mtime:
+            min_mtime = mtime
+        if max_mtime is None or mtime > max_mtime:
+            max_mtime = mtime
+        if mtimes is not None:
+            mtimes[os.path.abspath(entry.path)] = mtime
+
+    if client is not None:
+        root = os.path.abspath(cache_dir)
+        key = STATS_KEY_PREFIX + root
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.delete(key, key + ":mtimes")
+            pipe.hset(key, mapping={
+                "files": file_count,
+                "size_bytes": total_size,
+                "scanned_at": time.time(),
+            })
+            items = list(mtimes.items())
+            for i in range(0, len(items), STATS_ZADD_BATCH):
+                pipe.zadd(key + ":mtimes", dict(items[i:i + STATS_ZADD_BATCH]))
+            pipe.sadd(STATS_ROOTS_KEY, root)
+            pipe.execute()
+        except Exception as e:
+            _stats_disable(e)
+
+    return {
+        "exists": True,
+        "files": file_count,
+        "size_mb": round(total_size / (1024 * 1024), 2),
+        "oldest": _iso(min_mtime),
+        "newest": _iso(max_mtime)
+    }
+
+
 def get_cache_stats(cache_dir: Path) -> dict:
     """
     Get statistics about cache directory.
 
+    Served from Redis (one pipelined round-trip) when available and fresh,
+    otherwise the directory is walked via reconcile_cache_stats.
+
     Args:
         cache_dir: Directory to analyze
 
@@ -120,22 +366,93 @@ def get_cache_stats(cache_dir: Path) -> dict:
             "newest": None
         }
 
-    files = list(cache_dir.rglob("*"))
-    file_count = sum(1 for f in files if f.is_file())
-    total_size = sum(f.stat().st_size for f in files if f.is_file())
+    client = _stats_client()
+    if client is not None:
+        key = STATS_KEY_PREFIX + os.path.abspath(cache_dir)
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hgetall(key)
+            pipe.zrange(key + ":mtimes", 0, 0, withscores=True)
+            pipe.zrange(key + ":mtimes", -1, -1, withscores=True)
+            stats, oldest, newest = pipe.execute()
+        except Exception as e:
+            _stats_disable(e)
+            stats = None
+
+        if stats:
+            stats = {
+                (k.decode() if isinstance(k, bytes) else k): float(v)
+                for k, v in stats.items()
+            }
+            if time.time() - stats.get("scanned_at", 0) < STATS_RESCAN_SECONDS:
+                return {
+                    "exists": True,
+                    "files": int(stats.get("files", 0)),
+                    "size_mb": round(stats.get("size_bytes", 0) / (1024 * 1024), 2),
+                    "oldest": _iso(oldest[0][1]) if oldest else None,
+                    "newest": _iso(newest[0][1]) if newest else None
+                }
+
+    return reconcile_cache_stats(cache_dir)
+
+
+def record_cache_write(cache_path: Path, old_size: Optional[int] = None) -> None:
+    """
+    Account a cache file written outside atomic_write_cache* (e.g. by a
+    third-party client that only accepts an output path) in cache stats.
+
+    Args:
+        cache_path: Path to the file that has just been written
+        old_size: Size of the file it replaced (None if it is a new file)
+    """
+    try:
+        size = os.stat(cache_path).st_size
+    except OSError:
+        return
+    _stats_record_write(cache_path, size, old_size)
 
-    mtimes = [
-        datetime.fromtimestamp(f.stat().st_mtime, tz=timezone.utc)
-        for f in files if f.is_file()
-    ]
 
-    return {
-        "exists": True,
-        "files": file_count,
-        "size_mb": round(total_size / (1024 * 1024), 2),
-        "oldest": min(mtimes).isoformat() if mtimes else None,
-        "newest": max(mtimes).isoformat() if mtimes else None
-    }
+def remove_cache_file(cache_path: Path) -> int:
+    """
+    Delete a cache file and account the removal in cache stats.
+
+    Args:
+        cache_path: Path to the cached file
+
+    Returns:
+        Number of bytes freed
+
+    Raises:
+        OSError: If the file cannot be stat'ed or deleted
+    """
+    size = os.stat(cache_path).st_size
+    os.unlink(cache_path)
+    _stats_update([(os.path.abspath(cache_path), -1, -size, None)])
+    return size
+
+
+# Backoff bounds for contended file_lock acquisition (seconds)
+LOCK_BACKOFF_INITIAL = 0.001
+LOCK_BACKOFF_MAX = 0.1
+
+
+def cache_lock_path(cache_path: Path) -> Path:
+    """
+    Lock file guarding writes to cache_path.
+
+    All entries of a directory share one lock file that is never deleted, so
+    lock files don't pile up next to every cache entry and no waiter can end
+    up holding an fd to an unlinked inode. Because the lock is shared, hold
+    it only around the final check-then-rename: write the temp file (and
+    consume any network stream) before taking it.
+
+    Args:
+        cache_path: Path to the cached file
+
+    Returns:
+        Path to the directory lock file
+    """
+    return cache_path.parent / LOCK_NAME
 
 
 @contextmanager
@@ -154,7 +471,7 @@ def file_lock(lock_path: Path, timeout: float = 30.0):
         TimeoutError: If lock cannot be acquired within timeout
 
     Example:
-        with file_lock(Path("cache/myfile.lock")):
+        with file_lock(cache_lock_path(Path("cache/myfile.tif"))):
             # Do atomic operations
             pass
     """
@@ -165,18 +482,21 @@ def file_lock(lock_path: Path, timeout: float = 30.0):
         # Create or open lock file
         lock_file = open(lock_path, 'w')
 
-        # Try to acquire exclusive lock with timeout
-        import time
-        start_time = time.time()
+        # Try to acquire exclusive lock with timeout; back off exponentially
+        # (1ms -> 100ms) so short critical sections are picked up quickly
+        deadline = time.monotonic() + timeout
+        delay = LOCK_BACKOFF_INITIAL
         while True:
             try:
                 fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                logger.debug(f"Acquired lock: {lock_path}")
+                logger.debug("Acquired lock: %s", lock_path)
                 break
             except IOError:
-                if time.time() - start_time >= timeout:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     raise TimeoutError(f"Could not acquire lock on {lock_path} within {timeout}s")
-                time.sleep(0.1)
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, LOCK_BACKOFF_MAX)
 
         yield lock_file
 
@@ -186,16 +506,104 @@ def file_lock(lock_path: Path, timeout: float = 30.0):
             try:
                 fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
                 lock_file.close()
-                logger.debug(f"Released lock: {lock_path}")
+                logger.debug("Released lock: %s", lock_path)
             except Exception as e:
                 logger.error(f"Error releasing lock {lock_path}: {e}")
+        # Lock file is intentionally kept: unlinking it races with waiters
+        # that already hold an fd to the old inode.
+
 
-        # Clean up lock file
+# Anonymous temp files (Linux): never visible mid-write, never orphaned
+_O_TMPFILE = getattr(os, "O_TMPFILE", 0)
+_TMP_MODE = 0o600  # same as tempfile.mkstemp
+
+
+def _create_tmp(cache_path: Path) -> Tuple[int, Optional[Path]]:
+    """
+    Open a temp file for writing next to cache_path.
+
+    Returns:
+        (fd, path); path is None for an anonymous O_TMPFILE file
+    """
+    if _O_TMPFILE:
         try:
-            if lock_path.exists():
-                lock_path.unlink()
-        except Exception as e:
-            logger.warning(f"Could not delete lock file {lock_path}: {e}")
+            # O_RDWR so the content can still be copied out if linking fails
+            return os.open(cache_path.parent, _O_TMPFILE | os.O_RDWR, _TMP_MODE), None
+        except OSError as e:
+            # Filesystem or kernel without O_TMPFILE support
+            if e.errno not in (errno.EOPNOTSUPP, errno.EISDIR, errno.EINVAL):
+                raise
+    fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix='.tmp_', suffix=cache_path.suffix)
+    return fd, Path(tmp_name)
+
+
+def _finalize_tmp(fd: int, tmp_path: Optional[Path], cache_path: Path) -> Path:
+    """
+    Flush a written temp file to disk and return a path that can be renamed
+    over cache_path. Anonymous files are linked in under a temp name only
+    now, when their content is complete.
+    """
+    os.fsync(fd)  # Ensure written to disk
+    if hasattr(os, "posix_fadvise"):
+        # Data is on disk; don't let large GeoTIFFs crowd out the page cache
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    if tmp_path is not None:
+        return tmp_path
+
+    tmp_path = cache_path.with_name(f".tmp_{os.urandom(6).hex()}{cache_path.suffix}")
+    try:
+        os.link(f"/proc/self/fd/{fd}", tmp_path, follow_symlinks=True)
+        return tmp_path
+    except OSError as e:
+        # No /proc or linkat() refused (e.g. sandboxed kernels): stop using
+        # O_TMPFILE in this process and copy this file out to a named temp
+        global _O_TMPFILE
+        _O_TMPFILE = 0
+        logger.warning("O_TMPFILE link failed (%s), falling back to named temp files", e)
+
+    out_fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix='.tmp_', suffix=cache_path.suffix)
+    tmp_path = Path(tmp_name)
+    try:
+        offset = 0
+        while True:
+            chunk = os.pread(fd, 1 << 20, offset)
+            if not chunk:
+                break
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(out_fd, view):]
+            offset += len(chunk)
+        os.fsync(out_fd)
+    except Exception:
+        tmp_path.unlink()
+        raise
+    finally:
+        os.close(out_fd)
+    return tmp_path
+
+
+def _replace_tmp(tmp_path: Path, cache_path: Path, size: int, use_lock: bool) -> None:
+    """
+    Rename a finished temp file over cache_path.
+
+    Only this step runs under the directory lock: the temp file is written
+    and fsync'ed before, so a slow source never blocks other writers. Redis
+    stats are looked up and updated outside the lock.
+    """
+    tracked = bool(_stats_roots_for(os.path.abspath(cache_path)))
+    old_size = None
+    if use_lock:
+        with file_lock(cache_lock_path(cache_path)):
+            if tracked:
+                old_size = _existing_size(cache_path)
+            os.replace(tmp_path, cache_path)
+    else:
+        if tracked:
+            old_size = _existing_size(cache_path)
+        os.replace(tmp_path, cache_path)
+    if tracked:
+        _stats_record_write(cache_path, size, old_size)
 
 
 def atomic_write_cache(
@@ -208,57 +616,94 @@ def atomic_write_cache(
 
     This prevents partial writes and race conditions by:
     1. Writing to a temporary file
-    2. Using file locking to prevent concurrent access
-    3. Atomically renaming temp file to final path
+    2. Atomically renaming temp file to final path under a file lock
 
     Args:
         cache_path: Final path for the cached file
         content: Binary content to write
-        use_lock: Whether to use file locking (default: True)
+        use_lock: Whether to lock around the rename (default: True)
 
     Example:
         atomic_write_cache(Path("cache/data.tif"), geotiff_bytes)
     """
     cache_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Lock file path (same name with .lock extension)
-    lock_path = cache_path.with_suffix(cache_path.suffix + '.lock')
-
-    def write_atomic():
-        # Create temporary file in same directory (for atomic rename)
-        with tempfile.NamedTemporaryFile(
-            mode='wb',
-            dir=cache_path.parent,
-            delete=False,
-            prefix='.tmp_',
-            suffix=cache_path.suffix
-        ) as tmp_file:
-            tmp_path = Path(tmp_file.name)
+    fd, tmp_path = _create_tmp(cache_path)
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            # Write content to temp file
+            tmp_file.write(content)
+            tmp_file.flush()
+            tmp_path = _finalize_tmp(tmp_file.fileno(), tmp_path, cache_path)
+
+        # Atomic rename (replaces existing file if present)
+        _replace_tmp(tmp_path, cache_path, len(content), use_lock)
+        logger.debug("Atomically wrote cache file: %s", cache_path)
+
+    except BaseException:
+        # Clean up temp file on error
+        if tmp_path is not None:
             try:
-                # Write content to temp file
-                tmp_file.write(content)
-                tmp_file.flush()
-                os.fsync(tmp_file.fileno())  # Ensure written to disk
+                tmp_path.unlink()
+            except FileNotFoundError:
+                pass
+        raise
 
-                # Atomic rename (replaces existing file if present)
-                tmp_path.rename(cache_path)
-                logger.debug(f"Atomically wrote cache file: {cache_path}")
 
-            except Exception as e:
-                # Clean up temp file on error
-                if tmp_path.exists():
-                    try:
-                        tmp_path.unlink()
-                    except Exception:
-                        pass
-                raise e
-
-    # Execute with or without locking
-    if use_lock:
-        with file_lock(lock_path):
-            write_atomic()
-    else:
-        write_atomic()
+def atomic_write_cache_stream(
+    cache_path: Path,
+    source: Union[BinaryIO, Iterable[bytes]],
+    chunk_size: int = 1 << 20,
+    use_lock: bool = True
+) -> int:
+    """
+    Atomically write a stream to cache file without buffering it in memory.
+
+    Same guarantees as atomic_write_cache (temp file + fsync + rename under
+    optional lock), but content is copied chunk by chunk. The source is
+    consumed before the lock is taken.
+
+    Args:
+        cache_path: Final path for the cached file
+        source: Binary file-like object (read()) or iterable of byte chunks
+        chunk_size: Copy buffer size for file-like sources (default: 1 MiB)
+        use_lock: Whether to lock around the rename (default: True)
+
+    Returns:
+        Number of bytes written
+
+    Example:
+        resp = requests.get(url, stream=True)
+        atomic_write_cache_stream(Path("cache/data.tif"), resp.iter_content(1 << 20))
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = _create_tmp(cache_path)
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            if hasattr(source, "read"):
+                shutil.copyfileobj(source, tmp_file, length=chunk_size)
+            else:
+                for chunk in source:
+                    if chunk:
+                        tmp_file.write(chunk)
+            tmp_file.flush()
+            written = tmp_file.tell()
+            tmp_path = _finalize_tmp(tmp_file.fileno(), tmp_path, cache_path)
+
+        # Atomic rename (replaces existing file if present)
+        _replace_tmp(tmp_path, cache_path, written, use_lock)
+        logger.debug("Atomically streamed cache file: %s (%s bytes)", cache_path, written)
+        return written
+
+    except BaseException:
+        # Clean up temp file on error
+        if tmp_path is not None:
+            try:
+                tmp_path.unlink()
+            except FileNotFoundError:
+                pass
+        raise
 
 
 def safe_cache_read(
@@ -268,6 +713,10 @@ def safe_cache_read(
     """
     Safely read cache file with optional locking.
 
+    The file is opened under the lock and read after it is released: the
+    open fd keeps pointing at a complete file even if a writer renames a
+    new version over it meanwhile.
+
     Args:
         cache_path: Path to cached file
         use_lock: Whether to use file locking (default: True)
@@ -283,21 +732,68 @@ def safe_cache_read(
     if not cache_path.exists():
         return None
 
-    lock_path = cache_path.with_suffix(cache_path.suffix + '.lock')
+    try:
+        if use_lock:
+            with file_lock(cache_lock_path(cache_path)):
+                f = open(cache_path, 'rb')
+        else:
+            f = open(cache_path, 'rb')
+    except FileNotFoundError:
+        return None
 
-    def read_file():
-        try:
-            with open(cache_path, 'rb') as f:
-                return f.read()
-        except FileNotFoundError:
-            return None
+    with f:
+        return f.read()
 
-    # Execute with or without locking
-    if use_lock:
-        with file_lock(lock_path):
-            return read_file()
-    else:
-        return read_file()
+
+def send_cache_file(cache_path: Path, out_fd: int) -> int:
+    """
+    Copy a cache file to an open fd (socket or file) without reading it
+    into Python memory.
+
+    Uses os.sendfile (zero-copy in the kernel); falls back to a plain
+    read/write loop where sendfile is unavailable for the given fds.
+    HTTP handlers should return FileResponse(cache_path) instead, which
+    does the same internally; use safe_cache_read only when the bytes
+    are needed in-process.
+
+    Args:
+        cache_path: Path to cached file
+        out_fd: Destination file descriptor
+
+    Returns:
+        Number of bytes sent
+
+    Raises:
+        FileNotFoundError: If the cache file does not exist
+    """
+    in_fd = os.open(cache_path, os.O_RDONLY)
+    try:
+        size = os.fstat(in_fd).st_size
+        offset = 0
+        if hasattr(os, "sendfile"):
+            try:
+                while offset < size:
+                    sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return offset
+            except OSError as e:
+                if offset or e.errno not in (errno.EINVAL, errno.ENOSYS, errno.ENOTSUP):
+                    raise
+                logger.debug("sendfile unavailable for %s: %s, falling back to copy", cache_path, e)
+
+        while True:
+            chunk = os.read(in_fd, 1 << 20)
+            if not chunk:
+                break
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(out_fd, view):]
+            offset += len(chunk)
+        return offset
+    finally:
+        os.close(in_fd)
 
 
 def is_cache_valid(
@@ -321,27 +817,28 @@ def is_cache_valid(
             data = fetch_fresh_data()
             write_cache(cache_path, data)
     """
-    if not cache_path.exists():
+    # One stat answers existence, type and age
+    try:
+        st = os.stat(cache_path)
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        logger.error(f"Error checking cache validity for {cache_path}: {e}")
+        return False
+
+    if not S_ISREG(st.st_mode):
         return False
 
     # If no TTL specified, just check existence
     if max_age_seconds is None:
         return True
 
-    try:
-        # Get file modification time
-        mtime = datetime.fromtimestamp(cache_path.stat().st_mtime, tz=timezone.utc)
-        age = (datetime.now(timezone.utc) - mtime).total_seconds()
-
-        is_valid = age <= max_age_seconds
-        if not is_valid:
-            logger.debug(f"Cache expired: {cache_path} (age: {age:.0f}s, max: {max_age_seconds}s)")
+    age = time.time() - st.st_mtime
+    is_valid = age <= max_age_seconds
+    if not is_valid:
+        logger.debug("Cache expired: %s (age: %.0fs, max: %ss)", cache_path, age, max_age_seconds)
 
-        return is_valid
-
-    except Exception as e:
-        logger.error(f"Error checking cache validity for {cache_path}: {e}")
-        return False
+    return is_valid
 
 
 def get_cache_age_seconds(cache_path: Path) -> Optional[float]:
@@ -359,12 +856,10 @@ def get_cache_age_seconds(cache_path: Path) -> Optional[float]:
         if age and age > 3600:
             print("Cache is over 1 hour old")
     """
-    if not cache_path.exists():
-        return None
-
     try:
-        mtime = datetime.fromtimestamp(cache_path.stat().st_mtime, tz=timezone.utc)
-        return (datetime.now(timezone.utc) - mtime).total_seconds()
+        return time.time() - os.stat(cache_path).st_mtime
+    except FileNotFoundError:
+        return None
     except Exception as e:
         logger.error(f"Error getting cache age for {cache_path}: {e}")
         return None
@@ -386,18 +881,83 @@ def touch_cache_file(cache_path: Path) -> bool:
             touch_cache_file(cache_path)  # Extend TTL
             return read_cache(cache_path)
     """
-    if not cache_path.exists():
-        return False
-
     try:
-        cache_path.touch()
-        logger.debug(f"Touched cache file: {cache_path}")
+        # utime (unlike Path.touch) never creates the file, no exists() needed
+        os.utime(cache_path)
+        logger.debug("Touched cache file: %s", cache_path)
         return True
+    except FileNotFoundError:
+        return False
     except Exception as e:
         logger.error(f"Error touching cache file {cache_path}: {e}")
         return False
 
 
+def open_valid_cache(
+    cache_path: Path,
+    max_age_seconds: Optional[int] = None,
+    touch: bool = False
+) -> Optional[bytes]:
+    """
+    Read a cache file if it exists and is not expired, in one open + fstat.
+
+    Fuses is_cache_valid + safe_cache_read (+ touch_cache_file) on a single
+    file descriptor, so there is no exists()/open() race and no extra stats.
+
+    Args:
+        cache_path: Path to cached file
+        max_age_seconds: Maximum age in seconds (None = no age check)
+        touch: Update mtime to "now" on hit to extend TTL (default: False)
+
+    Returns:
+        File content as bytes, or None if missing or expired
+
+    Example:
+        data = open_valid_cache(cache_path, max_age_seconds=3600, touch=True)
+        if data is None:
+            data = fetch_fresh_data()
+    """
+    try:
+        fd = os.open(cache_path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.error(f"Error opening cache file {cache_path}: {e}")
+        return None
+
+    try:
+        st = os.fstat(fd)
+        if max_age_seconds is not None:
+            age = time.time() - st.st_mtime
+            if age > max_age_seconds:
+                logger.debug("Cache expired: %s (age: %.0fs, max: %ss)", cache_path, age, max_age_seconds)
+                return None
+
+        chunks = []
+        remaining = st.st_size
+        while True:
+            # Read st_size in one go; loop only on short reads or growth
+            chunk = os.read(fd, max(remaining, 1 << 16))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+        if touch:
+            try:
+                os.utime(fd)
+            except OSError as e:
+                logger.warning(f"Error touching cache file {cache_path}: {e}")
+        return data
+
+    except OSError as e:
+        logger.error(f"Error reading cache file {cache_path}: {e}")
+        return None
+    finally:
+        os.close(fd)
+
+
 def cleanup_expired_cache(
     cache_dir: Path,
     max_age_seconds: int,
@@ -430,24 +990,34 @@ def cleanup_expired_cache(
 
     deleted_count = 0
     freed_bytes = 0
-    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+    now = time.time()
+    cutoff_ts = now - max_age_seconds
+    debug = logger.isEnabledFor(logging.DEBUG)
+    removed = []  # for Redis stats
 
-    for file_path in cache_dir.rglob(file_pattern):
-        if not file_path.is_file():
+    for entry in _walk(cache_dir):
+        if entry.name == LOCK_NAME:
+            continue
+        if file_pattern != "*" and not fnmatch.fnmatchcase(entry.name, file_pattern):
             continue
 
+        file_path = entry.path
         try:
-            mtime = datetime.fromtimestamp(file_path.stat().st_mtime, tz=timezone.utc)
-            if mtime < cutoff:
-                size = file_path.stat().st_size
+            stat = entry.stat(follow_symlinks=False)
+            mtime = stat.st_mtime
+            if mtime < cutoff_ts:
+                size = stat.st_size
                 if not dry_run:
-                    file_path.unlink()
+                    os.unlink(file_path)
+                    removed.append((os.path.abspath(file_path), -1, -size, None))
                 deleted_count += 1
                 freed_bytes += size
-                logger.debug(f"Deleted expired cache file: {file_path} (age: {(datetime.now(timezone.utc) - mtime).total_seconds():.0f}s)")
+                if debug:
+                    logger.debug("Deleted expired cache file: %s (age: %.0fs)", file_path, now - mtime)
         except Exception as e:
             logger.error(f"Failed to process {file_path}: {e}")
 
+    _stats_update(removed)
     freed_mb = freed_bytes / (1024 * 1024)
     logger.info(
         f"Expired cache cleanup {'(dry run)' if dry_run else ''}: "
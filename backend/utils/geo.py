@@ -2,12 +2,19 @@
 Geospatial utilities for resolution calculation and bbox operations
 """
 
-from typing import Tuple, List, Optional
+from functools import lru_cache
+from typing import Sequence, Tuple, List, Optional
 import math
 
+import numpy as np
+
+# Approximate meters per degree (WGS84): longitude at the equator, latitude
+METERS_PER_DEG_LON_EQUATOR = 111320.0
+METERS_PER_DEG_LAT = 110540.0
+
 
 def choose_optimal_resolution(
-    bbox: List[float],
+    bbox: Sequence[float],
     target_mpp: int = 60,
     min_mpp: int = 10,
     max_mpp: int = 1500,
@@ -17,6 +24,9 @@ def choose_optimal_resolution(
     """
     Calculate optimal resolution for a given bounding box.
 
+    Results are memoized per (bbox, params), since most calls repeat the
+    same AOI (e.g. the Akmola bbox).
+
     Args:
         bbox: [minLon, minLat, maxLon, maxLat]
         target_mpp: Target meters per pixel (default: 60)
@@ -28,34 +38,30 @@ def choose_optimal_resolution(
     Returns:
         Tuple of (width_pixels, height_pixels)
     """
+    return _choose_optimal_resolution(
+        tuple(float(v) for v in bbox), target_mpp, min_mpp, max_mpp, min_pixels, max_pixels
+    )
+
+
+@lru_cache(maxsize=1024)
+def _choose_optimal_resolution(
+    bbox: Tuple[float, float, float, float],
+    target_mpp: int,
+    min_mpp: int,
+    max_mpp: int,
+    min_pixels: int,
+    max_pixels: int,
+) -> Tuple[int, int]:
     minLon, minLat, maxLon, maxLat = bbox
 
-    # Calculate bbox dimensions in degrees
-    lon_deg = abs(maxLon - minLon)
-    lat_deg = abs(maxLat - minLat)
-
-    # Convert to approximate meters (at latitude center)
+    # Convert bbox dimensions to approximate meters (at latitude center)
     lat_center = (minLat + maxLat) / 2.0
-    meters_per_deg_lon = 111320 * math.cos(math.radians(lat_center))
-    meters_per_deg_lat = 110540
-
-    width_m = lon_deg * meters_per_deg_lon
-    height_m = lat_deg * meters_per_deg_lat
-
-    # Calculate pixels based on target resolution
-    width_px = int(width_m / target_mpp)
-    height_px = int(height_m / target_mpp)
-
-    # Constrain to min/max pixels
-    if width_px < min_pixels:
-        width_px = min_pixels
-    elif width_px > max_pixels:
-        width_px = max_pixels
+    width_m = abs(maxLon - minLon) * METERS_PER_DEG_LON_EQUATOR * math.cos(math.radians(lat_center))
+    height_m = abs(maxLat - minLat) * METERS_PER_DEG_LAT
 
-    if height_px < min_pixels:
-        height_px = min_pixels
-    elif height_px > max_pixels:
-        height_px = max_pixels
+    # Pixels at target resolution, constrained to min/max pixels
+    width_px = min(max(int(width_m / target_mpp), min_pixels), max_pixels)
+    height_px = min(max(int(height_m / target_mpp), min_pixels), max_pixels)
 
     # Recalculate actual mpp based on constrained pixels
     actual_mpp_x = width_m / width_px if width_px > 0 else target_mpp
@@ -69,13 +75,60 @@ def choose_optimal_resolution(
         height_px = max(min_pixels, int(height_px / scale_factor))
     elif actual_mpp_x > max_mpp or actual_mpp_y > max_mpp:
         # Too coarse, increase pixels
-        scale_factor = min(max_mpp / actual_mpp_x, max_mpp / actual_mpp_y)
         width_px = min(max_pixels, int(width_px * (actual_mpp_x / max_mpp)))
         height_px = min(max_pixels, int(height_px * (actual_mpp_y / max_mpp)))
 
     return (width_px, height_px)
 
 
+def choose_optimal_resolution_batch(
+    bboxes: np.ndarray,
+    target_mpp: int = 60,
+    min_mpp: int = 10,
+    max_mpp: int = 1500,
+    min_pixels: int = 64,
+    max_pixels: int = 4096
+) -> np.ndarray:
+    """
+    Vectorized choose_optimal_resolution for many bounding boxes at once.
+
+    Args:
+        bboxes: (N, 4) array of [minLon, minLat, maxLon, maxLat]
+        target_mpp, min_mpp, max_mpp, min_pixels, max_pixels: see choose_optimal_resolution
+
+    Returns:
+        (N, 2) int64 array of (width_pixels, height_pixels)
+    """
+    b = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+
+    lat_center = (b[:, 1] + b[:, 3]) / 2.0
+    width_m = np.abs(b[:, 2] - b[:, 0]) * METERS_PER_DEG_LON_EQUATOR * np.cos(np.radians(lat_center))
+    height_m = np.abs(b[:, 3] - b[:, 1]) * METERS_PER_DEG_LAT
+
+    width_px = np.clip((width_m / target_mpp).astype(np.int64), min_pixels, max_pixels)
+    height_px = np.clip((height_m / target_mpp).astype(np.int64), min_pixels, max_pixels)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mpp_x = np.where(width_px > 0, width_m / width_px, target_mpp)
+        mpp_y = np.where(height_px > 0, height_m / height_px, target_mpp)
+
+        too_fine = (mpp_x < min_mpp) | (mpp_y < min_mpp)
+        too_coarse = ~too_fine & ((mpp_x > max_mpp) | (mpp_y > max_mpp))
+
+        # Too fine: reduce pixels
+        scale = np.maximum(min_mpp / mpp_x, min_mpp / mpp_y)
+        fine_w = np.maximum(min_pixels, np.nan_to_num(width_px / scale).astype(np.int64))
+        fine_h = np.maximum(min_pixels, np.nan_to_num(height_px / scale).astype(np.int64))
+
+        # Too coarse: increase pixels
+        coarse_w = np.minimum(max_pixels, (width_px * (mpp_x / max_mpp)).astype(np.int64))
+        coarse_h = np.minimum(max_pixels, (height_px * (mpp_y / max_mpp)).astype(np.int64))
+
+    width_px = np.where(too_fine, fine_w, np.where(too_coarse, coarse_w, width_px))
+    height_px = np.where(too_fine, fine_h, np.where(too_coarse, coarse_h, height_px))
+    return np.stack([width_px, height_px], axis=1)
+
+
 def bbox_from_geojson(geojson: dict) -> Optional[Tuple[float, float, float, float]]:
     """
     Extract bounding box from GeoJSON geometry.
@@ -98,25 +151,42 @@ def bbox_from_geojson(geojson: dict) -> Optional[Tuple[float, float, float, floa
             lon, lat = coords
             return (lon, lat, lon, lat)
         elif geom_type == "Polygon":
-            all_coords = coords[0]  # Outer ring
+            rings = (coords[0],)  # Outer ring
         elif geom_type == "MultiPolygon":
-            all_coords = [pt for polygon in coords for pt in polygon[0]]
+            rings = [polygon[0] for polygon in coords]
         else:
             return None
 
-        # Calculate bbox
-        lons = [pt[0] for pt in all_coords]
-        lats = [pt[1] for pt in all_coords]
-
-        return (min(lons), min(lats), max(lons), max(lats))
+        # Calculate bbox in a single pass, without intermediate lists
+        min_lon = min_lat = math.inf
+        max_lon = max_lat = -math.inf
+        for ring in rings:
+            for pt in ring:
+                lon = pt[0]
+                lat = pt[1]
+                if lon < min_lon:
+                    min_lon = lon
+                if lon > max_lon:
+                    max_lon = lon
+                if lat < min_lat:
+                    min_lat = lat
+                if lat > max_lat:
+                    max_lat = lat
+
+        if min_lon > max_lon:
+            return None  # no points
+        return (min_lon, min_lat, max_lon, max_lat)
     except Exception:
         return None
 
 
+@lru_cache(maxsize=4096)
 def parse_bbox_string(bbox_str: str) -> Optional[Tuple[float, float, float, float]]:
     """
     Parse bbox string 'minLon,minLat,maxLon,maxLat' and normalize.
 
+    Memoised: the frontend keeps requesting the same AOI bboxes.
+
     Args:
         bbox_str: Comma-separated bbox string
 
@@ -124,7 +194,15 @@ def parse_bbox_string(bbox_str: str) -> Optional[Tuple[float, float, float, floa
         Normalized (minLon, minLat, maxLon, maxLat) or None if invalid
     """
     try:
-        x1, y1, x2, y2 = [float(x) for x in bbox_str.split(",")]
-        return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        a, b, c, d = bbox_str.split(",", 3)
+        x1 = float(a)
+        y1 = float(b)
+        x2 = float(c)
+        y2 = float(d)
+        if x1 > x2:
+            x1, x2 = x2, x1
+        if y1 > y2:
+            y1, y2 = y2, y1
+        return (x1, y1, x2, y2)
     except Exception:
         return None
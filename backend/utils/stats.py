@@ -2,26 +2,253 @@
 Statistical computation utilities for raster data
 """
 
-from typing import Dict
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
 
-def compute_basic_stats(data: np.ndarray) -> Dict[str, float]:
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+
+if njit is not None:
+    # No full fastmath: it assumes no NaNs and would fold the finite check
+    # away. Reassociation is enough to vectorize the reductions. nogil lets
+    # concurrent requests run their kernels side by side.
+    @njit(parallel=True, fastmath={"reassoc", "contract"}, nogil=True,
+          error_model="numpy", cache=True)
+    def _stats_kernel(flat, shift):  # pragma: no cover - JIT
+        # Sums are of (x - shift): with shift close to the mean, the one-pass
+        # variance ss/n - (s/n)^2 does not cancel catastrophically
+        n = 0
+        s = 0.0
+        ss = 0.0
+        mn = np.inf
+        mx = -np.inf
+        for i in prange(flat.size):
+            x = float(flat[i])  # float64 accumulation for float32 rasters
+            if np.isfinite(x):
+                d = x - shift
+                n += 1
+                s += d
+                ss += d * d
+                mn = min(mn, x)
+                mx = max(mx, x)
+        return n, s, ss, mn, mx
+
+    @njit(nogil=True, cache=True)
+    def _first_finite(flat):  # pragma: no cover - JIT
+        for i in range(flat.size):
+            x = float(flat[i])
+            if np.isfinite(x):
+                return x
+        return 0.0
+
+    @njit(nogil=True, cache=True)
+    def _gather_finite(flat, n):  # pragma: no cover - JIT
+        out = np.empty(n, dtype=flat.dtype)
+        j = 0
+        for i in range(flat.size):
+            x = flat[i]
+            if np.isfinite(x):
+                out[j] = x
+                j += 1
+        return out
+
+
+# Below this many pixels a thread pool costs more than it saves
+PARALLEL_MIN_SIZE = 1_000_000
+_WORKERS = os.cpu_count() or 1
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Process-wide pool for chunked reductions (created lazily)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=_WORKERS, thread_name_prefix="stats")
+    return _executor
+
+
+# Default percentiles and their precomputed quantile fractions; the
+# comprehensive variant has the median (0.5) prepended
+_DEFAULT_PCTS = (10, 25, 50, 75, 90)
+_DEFAULT_Q = np.array(_DEFAULT_PCTS, dtype=np.float64) / 100.0
+_MEDIAN_Q = np.array([0.5])
+_MEDIAN_DEFAULT_Q = np.concatenate((_MEDIAN_Q, _DEFAULT_Q))
+
+
+def _to_q(percentiles: Sequence[float]) -> np.ndarray:
+    """Percentiles (0..100) -> quantile fractions, cached array for the defaults."""
+    if percentiles is _DEFAULT_PCTS or tuple(percentiles) == _DEFAULT_PCTS:
+        return _DEFAULT_Q
+    return np.asarray(percentiles, dtype=np.float64) / 100.0
+
+
+def _unmask(data: np.ndarray) -> np.ndarray:
     """
-    Compute basic statistics for numpy array, handling NaN/infinite values.
+    Plain ndarray view of data: masked arrays are reduced to their unmasked
+    values (1-D), since the fast paths below only see the raw buffer.
+    """
+    if isinstance(data, np.ma.MaskedArray):
+        return data.compressed()
+    return data
+
+
+def _finite_values(data: np.ndarray) -> np.ndarray:
+    """
+    1-D copy of the finite values of data (one allocation).
+
+    Boolean-mask indexing is already a single gather; when every value is
+    finite (typical for clipped rasters) a plain contiguous copy is cheaper
+    still. The result is owned by the caller and may be partitioned in place.
+    """
+    data = _unmask(data)
+    finite = np.isfinite(data)
+    if finite.all():
+        return data.reshape(-1).copy()
+    return data[finite]
+
+
+class _Prepared(NamedTuple):
+    """Finite values of a raster plus their moments (see _prepare)."""
+    valid: np.ndarray
+    mean: float
+    std: float
+    min: float
+    max: float
+
+
+def _prepare(data: np.ndarray) -> _Prepared:
+    """
+    Single-pass count/mean/std/min/max over finite values.
+
+    Shared by all public entry points, so the mask/gather pass over `data`
+    happens once per call.
+
+    Uses a fused Numba kernel for float arrays when numba is installed,
+    otherwise per-chunk isfinite masks and reductions (see _partial_stats),
+    run in a thread pool for rasters of PARALLEL_MIN_SIZE pixels or more.
 
     Args:
-        data: Numpy array (can contain NaN or infinite values)
+        data: Numpy array (can contain NaN or infinite values); masked
+            elements of a MaskedArray are ignored
 
     Returns:
-        Dictionary with mean, median, std, min, max (or None if no valid data)
+        _Prepared; valid is the 1-D array of finite values (empty if there
+        are none, then the scalars are meaningless)
+    """
+    data = _unmask(data)
+    if njit is not None and data.dtype in (np.float32, np.float64):
+        flat = data.ravel()
+        shift = _first_finite(flat)
+        n, s, ss, mn, mx = _stats_kernel(flat, shift)
+        # All finite: a memcpy beats the branchy gather loop
+        valid = flat.copy() if n == flat.size else _gather_finite(flat, n)
+        if n == 0:
+            return _Prepared(valid, 0.0, 0.0, 0.0, 0.0)
+        offset = s / n
+        var = max(ss / n - offset * offset, 0.0)
+        return _Prepared(valid, shift + offset, float(np.sqrt(var)), mn, mx)
+
+    flat = data.reshape(-1)
+    if flat.size < PARALLEL_MIN_SIZE or _WORKERS < 2:
+        valid, n, mean, m2, mn, mx = _partial_stats(flat)
+        if n == 0:
+            return _Prepared(valid, 0.0, 0.0, 0.0, 0.0)
+        return _Prepared(valid, mean, float(np.sqrt(m2 / n)), mn, mx)
+
+    # Large raster: reduce chunks in threads (NumPy releases the GIL inside
+    # ufuncs), then merge (n, mean, M2) pairwise (Chan et al.)
+    parts = list(_get_executor().map(_partial_stats, np.array_split(flat, _WORKERS)))
+    valid = np.concatenate([p[0] for p in parts])
+    n, mean, m2, mn, mx = 0, 0.0, 0.0, np.inf, -np.inf
+    for _, n_b, mean_b, m2_b, mn_b, mx_b in parts:
+        if n_b == 0:
+            continue
+        total = n + n_b
+        delta = mean_b - mean
+        mean += delta * n_b / total
+        m2 += m2_b + delta * delta * n * n_b / total
+        n = total
+        mn = min(mn, mn_b)
+        mx = max(mx, mx_b)
+
+    if n == 0:
+        return _Prepared(valid, 0.0, 0.0, 0.0, 0.0)
+    return _Prepared(valid, mean, float(np.sqrt(m2 / n)), mn, mx)
+
+
+def _partial_stats(flat: np.ndarray) -> Tuple[np.ndarray, int, float, float, float, float]:
+    """
+    Finite values and (n, mean, M2, min, max) of one 1-D chunk.
+
+    M2 is the sum of squared deviations from the mean. bottleneck (if
+    installed) is used for min/max, and for mean/std on float64 only, since
+    it accumulates float32 in float32.
+    """
+    valid = _finite_values(flat)
+    n = valid.size
+    if n == 0:
+        return valid, 0, 0.0, 0.0, 0.0, 0.0
+
+    if bn is not None:
+        mn, mx = bn.nanmin(valid), bn.nanmax(valid)
+        if valid.dtype == np.float64:
+            # Single C loop each, no (valid - mean) temporary
+            return valid, n, float(bn.nanmean(valid)), float(bn.nanvar(valid, ddof=0)) * n, mn, mx
+    else:
+        mn, mx = valid.min(), valid.max()
+
+    # Keep the array in its own dtype (float32 rasters stay float32, half the
+    # bytes per pass); only the accumulators are float64
+    mean = valid.sum(dtype=np.float64) / n
+    shift = valid.dtype.type(mean) if valid.dtype.kind == "f" else mean
+    dev = valid - shift
+    ss = np.einsum("i,i->", dev, dev, dtype=np.float64)
+    # Deviations are taken from the rounded mean; remove that offset's share
+    m2 = max(ss - n * (mean - float(shift)) ** 2, 0.0)
+    return valid, n, float(mean), m2, mn, mx
+
+
+def _quantiles(valid: np.ndarray, q: np.ndarray) -> np.ndarray:
     """
-    # Use masked arrays for efficient handling of invalid values
-    masked = np.ma.masked_invalid(data)
+    Quantiles of a 1-D finite array via one np.partition (O(n) selection).
+
+    Matches np.quantile's default 'linear' interpolation. Partitions
+    `valid` in place, so pass an array that the caller owns.
 
-    if masked.count() == 0:
-        # Explicitly delete masked array to free memory
-        del masked
+    Args:
+        valid: 1-D array of finite values (non-empty)
+        q: Float64 array of quantile fractions in [0, 1]
+
+    Returns:
+        Float64 array of quantile values, in the order given
+    """
+    n = valid.size
+    pos = q * (n - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    valid.partition(np.unique(np.concatenate((lo, hi))))
+    below = valid[lo].astype(np.float64)
+    return below + (valid[hi] - below) * (pos - lo)
+
+
+def _compute_basic(prep: _Prepared, median: Optional[float]) -> Dict[str, float]:
+    """Basic stats dict from prepared data (median computed by the caller)."""
+    if prep.valid.size == 0:
         return {
             "mean": None,
             "median": None,
@@ -30,98 +257,107 @@ def compute_basic_stats(data: np.ndarray) -> Dict[str, float]:
             "max": None,
         }
 
-    result = {
-        "mean": float(masked.mean()),
-        "median": float(np.ma.median(masked)),
-        "std": float(masked.std()),
-        "min": float(masked.min()),
-        "max": float(masked.max()),
+    return {
+        "mean": float(prep.mean),
+        "median": float(median),
+        "std": float(prep.std),
+        "min": float(prep.min),
+        "max": float(prep.max),
     }
 
-    # Explicitly delete masked array to free memory
-    del masked
-    return result
+
+def _compute_percentiles(
+    valid: np.ndarray,
+    percentiles: Sequence[float],
+    values: Optional[np.ndarray] = None
+) -> Dict[str, float]:
+    """
+    Percentile dict from already filtered finite values.
+
+    Args:
+        valid: 1-D array of finite values (may be partitioned in place)
+        percentiles: Percentile values to compute
+        values: Precomputed percentile values (skips the partition)
+    """
+    if valid.size == 0:
+        return {f"p{p}": None for p in percentiles}
+
+    if values is None:
+        values = _quantiles(valid, _to_q(percentiles))
+    return {f"p{p}": float(v) for p, v in zip(percentiles, values)}
+
+
+def compute_basic_stats(data: np.ndarray) -> Dict[str, float]:
+    """
+    Compute basic statistics for numpy array, handling NaN/infinite values.
+
+    Args:
+        data: Numpy array (can contain NaN or infinite values)
+
+    Returns:
+        Dictionary with mean, median, std, min, max (or None if no valid data)
+    """
+    prep = _prepare(data)
+    median = _quantiles(prep.valid, _MEDIAN_Q)[0] if prep.valid.size else None
+    return _compute_basic(prep, median)
 
 
 def compute_percentiles(
     data: np.ndarray,
-    percentiles: list = [10, 25, 50, 75, 90]
+    percentiles: Optional[Sequence[float]] = None
 ) -> Dict[str, float]:
     """
     Compute percentiles for numpy array, handling NaN/infinite values.
 
     Args:
         data: Numpy array (can contain NaN or infinite values)
-        percentiles: List of percentile values to compute (default: [10, 25, 50, 75, 90])
+        percentiles: Percentile values to compute (default: 10, 25, 50, 75, 90)
 
     Returns:
         Dictionary mapping percentile keys (p10, p25, etc.) to values
     """
-    masked = np.ma.masked_invalid(data)
-
-    if masked.count() == 0:
-        # Clean up masked array before returning
-        del masked
-        return {f"p{p}": None for p in percentiles}
-
-    # Use compressed() to get only valid values
-    valid_data = masked.compressed()
-    values = np.percentile(valid_data, percentiles)
-    result = {f"p{p}": float(v) for p, v in zip(percentiles, values)}
-
-    # Explicitly delete temporary arrays to free memory
-    del valid_data
-    del values
-    del masked
-
-    return result
+    if percentiles is None:
+        percentiles = _DEFAULT_PCTS
+    # Moments are not needed here, only the finite values
+    return _compute_percentiles(_finite_values(data), percentiles)
 
 
 def compute_comprehensive_stats(
     data: np.ndarray,
-    percentiles: list = [10, 25, 50, 75, 90]
+    percentiles: Optional[Sequence[float]] = None
 ) -> Dict:
     """
     Compute comprehensive statistics including basic stats and percentiles.
 
+    Prefer this over calling compute_basic_stats and compute_percentiles
+    separately: the data is prepared and partitioned only once.
+
     Args:
         data: Numpy array (can contain NaN or infinite values)
-        percentiles: List of percentile values to compute
+        percentiles: Percentile values to compute (default: 10, 25, 50, 75, 90)
 
     Returns:
         Dictionary with all statistics
     """
-    masked = np.ma.masked_invalid(data)
+    if percentiles is None:
+        percentiles = _DEFAULT_PCTS
+    prep = _prepare(data)
+    valid = prep.valid
 
-    if masked.count() == 0:
-        # Clean up before returning
-        del masked
+    if valid.size == 0:
         return {
-            "mean": None,
-            "median": None,
-            "std": None,
-            "min": None,
-            "max": None,
-            "percentiles": {f"p{p}": None for p in percentiles},
+            **_compute_basic(prep, None),
+            "percentiles": _compute_percentiles(valid, percentiles),
             "pixels": 0
         }
 
-    valid_data = masked.compressed()
-    pct_values = np.percentile(valid_data, percentiles)
-
-    result = {
-        "mean": float(masked.mean()),
-        "median": float(np.ma.median(masked)),
-        "std": float(masked.std()),
-        "min": float(masked.min()),
-        "max": float(masked.max()),
-        "percentiles": {f"p{p}": float(v) for p, v in zip(percentiles, pct_values)},
-        "pixels": int(masked.count())
-    }
+    # Median and percentiles from one partition of the valid values
+    q = _to_q(percentiles)
+    q = _MEDIAN_DEFAULT_Q if q is _DEFAULT_Q else np.concatenate((_MEDIAN_Q, q))
+    values = _quantiles(valid, q)
 
-    # Explicitly delete temporary arrays to free memory
-    del valid_data
-    del pct_values
-    del masked
-
-    return result
+    return {
+        **_compute_basic(prep, values[0]),
+        "percentiles": _compute_percentiles(valid, percentiles, values[1:]),
+        "pixels": int(valid.size)
+    }
@@ -2,8 +2,87 @@
 Validation utilities for NDVI and BIOPAR modules.
 """
 
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+# Maximum bbox area in square degrees (~11,000 km² at equator)
+MAX_BBOX_AREA = 100
+
+# Sentinel-2A launch: no imagery before this date
+MIN_SENTINEL_DATE = datetime(2015, 6, 23, tzinfo=timezone.utc)
+
+
+_MIN_SENTINEL_YMD = (2015, 6, 23)
+
+# Days per month (non-leap year), index 1..12
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Cached UTC "today" as (year, month, day), valid until the next UTC midnight
+_today: Tuple[Tuple[int, int, int], float] = ((0, 0, 0), 0.0)
+
+
+def _is_leap(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _days_from_civil(ymd: Tuple[int, int, int]) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian (year, month, day)."""
+    y, m, d = ymd
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _today_utc() -> Tuple[int, int, int]:
+    """Current UTC date as a tuple; recomputed once per day."""
+    global _today
+    ymd, expires = _today
+    now = time.time()
+    if now >= expires:
+        today = datetime.fromtimestamp(now, tz=timezone.utc)
+        ymd = (today.year, today.month, today.day)
+        _today = (ymd, (now // 86400 + 1) * 86400)
+    return ymd
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_date(value: str) -> Tuple[int, int, int]:
+    """
+    Parse a YYYY-MM-DD string into a (year, month, day) tuple.
+
+    Canonical 10-character dates are decoded from their ASCII codes with a
+    days-per-month table, without strptime or datetime objects; anything
+    else goes through strptime, which also produces the error message.
+    Memoised, since request dates repeat.
+
+    Raises:
+        ValueError: If the string is not a valid date
+    """
+    b = value.encode("ascii", "replace")
+    if len(b) == 10 and b[4] == 45 and b[7] == 45:  # 45 == ord("-")
+        digits = [c - 48 for c in b[0:4] + b[5:7] + b[8:10]]
+        if all(0 <= c <= 9 for c in digits):
+            year = digits[0] * 1000 + digits[1] * 100 + digits[2] * 10 + digits[3]
+            month = digits[4] * 10 + digits[5]
+            day = digits[6] * 10 + digits[7]
+            if year < 1:
+                raise ValueError(f"year {year} is out of range")
+            if not 1 <= month <= 12:
+                raise ValueError("month must be in 1..12")
+            last = 29 if month == 2 and _is_leap(year) else _DAYS_IN_MONTH[month]
+            if not 1 <= day <= last:
+                raise ValueError("day is out of range for month")
+            return (year, month, day)
+
+    parsed = datetime.strptime(value, "%Y-%m-%d")
+    return (parsed.year, parsed.month, parsed.day)
 
 
 def validate_bbox(bbox: List[float]) -> None:
@@ -16,16 +95,24 @@ def validate_bbox(bbox: List[float]) -> None:
     Raises:
         ValueError: If bbox is invalid
     """
-    if not isinstance(bbox, (list, tuple)):
+    if not isinstance(bbox, (list, tuple, np.ndarray)):
         raise ValueError("bbox must be a list or tuple")
 
+    if isinstance(bbox, np.ndarray) and bbox.ndim != 1:
+        raise ValueError(f"bbox array must be 1-D, got shape {bbox.shape}")
+
     if len(bbox) != 4:
         raise ValueError(
             f"bbox must have exactly 4 values: [minLon, minLat, maxLon, maxLat], got {len(bbox)}"
         )
 
     try:
-        minlon, minlat, maxlon, maxlat = [float(x) for x in bbox]
+        if isinstance(bbox, np.ndarray):
+            # One C-level cast instead of four numpy-scalar float() calls
+            minlon, minlat, maxlon, maxlat = bbox.astype(np.float64, copy=False).tolist()
+        else:
+            # map() unpacks straight into the names, no temporary list
+            minlon, minlat, maxlon, maxlat = map(float, bbox)
     except (TypeError, ValueError) as e:
         raise ValueError(f"bbox values must be numeric: {e}")
 
@@ -54,15 +141,58 @@ def validate_bbox(bbox: List[float]) -> None:
 
     # Check reasonable area size (prevent too large requests)
     area = (maxlon - minlon) * (maxlat - minlat)
-    MAX_AREA = 100  # ~11,000 km² at equator
 
-    if area > MAX_AREA:
+    if area > MAX_BBOX_AREA:
         raise ValueError(
-            f"bbox area too large: {area:.2f}° (max {MAX_AREA}°). "
+            f"bbox area too large: {area:.2f}° (max {MAX_BBOX_AREA}°). "
             "Please use a smaller area."
         )
 
 
+def validate_bboxes(bboxes) -> np.ndarray:
+    """
+    Validate many bounding boxes at once (e.g. a batch of tile requests).
+
+    Same rules as validate_bbox, checked with vectorized comparisons over
+    the whole batch; the error message comes from validate_bbox for the
+    first invalid row.
+
+    Args:
+        bboxes: Array-like of shape (N, 4) with rows [minLon, minLat, maxLon, maxLat]
+
+    Returns:
+        The validated (N, 4) float64 array
+
+    Raises:
+        ValueError: If any bbox is invalid (message names the row index)
+    """
+    try:
+        arr = np.asarray(bboxes, dtype=np.float64)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"bbox values must be numeric: {e}")
+
+    if arr.ndim != 2 or arr.shape[1] != 4:
+        raise ValueError(f"bboxes must have shape (N, 4), got {arr.shape}")
+
+    minlon, minlat, maxlon, maxlat = arr.T
+    # Written as negated "ok" conditions so NaN counts as invalid
+    ok = (
+        (minlon >= -180) & (minlon <= 180) & (maxlon >= -180) & (maxlon <= 180)
+        & (minlat >= -90) & (minlat <= 90) & (maxlat >= -90) & (maxlat <= 90)
+        & (minlon < maxlon) & (minlat < maxlat)
+        & ((maxlon - minlon) * (maxlat - minlat) <= MAX_BBOX_AREA)
+    )
+
+    if not ok.all():
+        row = int(np.argmin(ok))
+        try:
+            validate_bbox(arr[row].tolist())
+        except ValueError as e:
+            raise ValueError(f"bbox #{row}: {e}") from None
+
+    return arr
+
+
 def validate_dates(start_date: str, end_date: str, max_days: int = 365) -> None:
     """
     Validate date format and logic.
@@ -77,21 +207,21 @@ def validate_dates(start_date: str, end_date: str, max_days: int = 365) -> None:
     """
     # Validate format
     try:
-        start = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-        end = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-    except ValueError as e:
+        start = _parse_iso_date(start_date)
+        end = _parse_iso_date(end_date)
+    except (TypeError, ValueError) as e:
         raise ValueError(
             f"Dates must be in YYYY-MM-DD format. Error: {e}"
         )
 
-    # Validate start <= end
+    # Validate start <= end (tuples compare field by field)
     if start > end:
         raise ValueError(
             f"start_date ({start_date}) must be <= end_date ({end_date})"
         )
 
     # Check reasonable time range
-    delta = (end - start).days
+    delta = _days_from_civil(end) - _days_from_civil(start)
     if delta > max_days:
         raise ValueError(
             f"Date range too large: {delta} days (max {max_days} days). "
@@ -99,15 +229,13 @@ def validate_dates(start_date: str, end_date: str, max_days: int = 365) -> None:
         )
 
     # Check not in future
-    now = datetime.now(timezone.utc)
-    if end > now:
+    if end > _today_utc():
         raise ValueError(
             f"end_date ({end_date}) cannot be in the future"
         )
 
     # Warn if dates are very old (satellite data may not be available)
-    MIN_SENTINEL_DATE = datetime(2015, 6, 23, tzinfo=timezone.utc)  # Sentinel-2A launch
-    if start < MIN_SENTINEL_DATE:
+    if start < _MIN_SENTINEL_YMD:
         raise ValueError(
             f"start_date ({start_date}) is before Sentinel-2 launch ({MIN_SENTINEL_DATE.date()}). "
             "No data available before this date."
@@ -127,30 +255,41 @@ def validate_bins(bins_str: str) -> List[float]:
     Raises:
         ValueError: If bins are invalid
     """
+    # NumPy's C parser: one call parses and allocates, whitespace tolerated.
+    # On malformed input it stops early (returns fewer values or raises),
+    # hence the count check against the number of commas.
     try:
-        bin_edges = [float(x.strip()) for x in bins_str.split(",")]
-    except ValueError as e:
-        raise ValueError(f"Invalid bins parameter: {e}")
-
-    if len(bin_edges) < 2:
+        arr = np.fromstring(bins_str, dtype=np.float64, sep=",")
+    except ValueError:
+        arr = None
+    if arr is None or arr.size != bins_str.count(",") + 1:
+        # Re-parse item by item only to report which value is bad
+        try:
+            for x in bins_str.split(","):
+                float(x)
+        except ValueError as e:
+            raise ValueError(f"Invalid bins parameter: {e}")
+        raise ValueError(f"Invalid bins parameter: {bins_str!r}")
+
+    if arr.size < 2:
         raise ValueError(
-            f"bins must have at least 2 values, got {len(bin_edges)}"
+            f"bins must have at least 2 values, got {arr.size}"
         )
 
-    # Validate NDVI range
-    if any(b < -1 or b > 1 for b in bin_edges):
+    # Validate NDVI range (NaN fails both comparisons)
+    if not (arr.min() >= -1 and arr.max() <= 1):
         raise ValueError(
             "Bin edges must be between -1 and 1 (NDVI range). "
-            f"Got: {bin_edges}"
+            f"Got: {arr.tolist()}"
         )
 
-    # Validate ascending order
-    if bin_edges != sorted(bin_edges):
+    # Validate ascending order (equal neighbours allowed, as before)
+    if not (np.diff(arr) >= 0).all():
         raise ValueError(
-            f"Bin edges must be in ascending order. Got: {bin_edges}"
+            f"Bin edges must be in ascending order. Got: {arr.tolist()}"
         )
 
-    return bin_edges
+    return arr.tolist()
 
 
 def validate_image_dimensions(width: int, height: int, max_total_pixels: int = 16_000_000) -> None: